@@ -26,9 +26,9 @@ print(f"   Catégorisées: {categorized}")
 # Check for duplicates
 db.cursor.execute("""
     SELECT COUNT(*) FROM (
-        SELECT date, description, amount, COUNT(*) as count
+        SELECT date, description, amount_cents, COUNT(*) as count
         FROM transactions
-        GROUP BY date, description, amount
+        GROUP BY date, description, amount_cents
         HAVING count > 1
     )
 """)
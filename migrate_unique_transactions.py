@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Migration script - Add unique (date, description, amount_cents) index to transactions
+"""
+import sqlite3
+from pathlib import Path
+
+def migrate_unique_transactions():
+    """Remove existing duplicates and create the unique index used on import"""
+    db_path = Path("data/database.db")
+    
+    if not db_path.exists():
+        print("❌ Database not found. Run the application first to create it.")
+        return False
+    
+    connection = sqlite3.connect(str(db_path))
+    cursor = connection.cursor()
+    
+    try:
+        # Check if index already exists
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name='idx_transactions_unique'")
+        if cursor.fetchone():
+            # The non-unique fallback index is redundant next to it
+            cursor.execute("DROP INDEX IF EXISTS idx_transactions_dup")
+            connection.commit()
+            print("✅ Index 'idx_transactions_unique' already exists.")
+            return True
+        
+        # Remove duplicates, keeping the first occurrence
+        cursor.execute("""
+            DELETE FROM transactions
+            WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY date, description, amount_cents ORDER BY id
+                    ) AS rn
+                    FROM transactions
+                )
+                WHERE rn > 1
+            )
+        """)
+        print(f"🗑️ {cursor.rowcount} transaction(s) dupliquée(s) supprimée(s)")
+        
+        cursor.execute("""
+            CREATE UNIQUE INDEX idx_transactions_unique
+            ON transactions (date, description, amount_cents)
+        """)
+        # Replaces the non-unique fallback created while duplicates existed
+        cursor.execute("DROP INDEX IF EXISTS idx_transactions_dup")
+        
+        connection.commit()
+        print("✅ Successfully created 'idx_transactions_unique' index.")
+        
+    except sqlite3.Error as e:
+        print(f"❌ Database error: {e}")
+        return False
+    finally:
+        connection.close()
+    
+    return True
+
+if __name__ == "__main__":
+    success = migrate_unique_transactions()
+    exit(0 if success else 1)
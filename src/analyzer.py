@@ -1,6 +1,7 @@
 """
 Analyzer module - Generates statistics and reports
 """
+import functools
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
 from collections import defaultdict
@@ -12,13 +13,39 @@ from io import BytesIO
 import base64
 
 
+# Maximum number of filter combinations memoized by _cached_until_write
+_RESULT_CACHE_SIZE = 32
+
+
+def _cached_until_write(method):
+    """Memoize an Analyzer method per arguments until the database changes"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._result_cache_version != self.db.data_version:
+            self._result_cache.clear()
+            self._result_cache_version = self.db.data_version
+        
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in self._result_cache:
+            if len(self._result_cache) >= _RESULT_CACHE_SIZE:
+                self._result_cache.pop(next(iter(self._result_cache)))
+            self._result_cache[key] = method(self, *args, **kwargs)
+        
+        # Callers get their own copy of the (flat) result dict
+        return dict(self._result_cache[key])
+    return wrapper
+
+
 class Analyzer:
     """Analyzes transactions and generates reports"""
     
     def __init__(self, db: Database):
         """Initialize analyzer"""
         self.db = db
+        self._result_cache = {}
+        self._result_cache_version = db.data_version
     
+    @_cached_until_write
     def get_statistics(self, start_date: str = None, end_date: str = None, category: str = None) -> Dict:
         """
         Get statistics for a date range and optional category
@@ -26,15 +53,14 @@ class Analyzer:
         Returns:
             Dictionary with statistics
         """
-        if start_date and end_date:
-            transactions = self.db.get_transactions_by_date_range(start_date, end_date)
-        else:
-            transactions = self.db.get_all_transactions()
-        
-        if category:
-            transactions = [t for t in transactions if t.category == category]
+        return self._statistics_from_totals(self.db.get_category_totals(start_date, end_date, category))
+    
+    @staticmethod
+    def _statistics_from_totals(rows) -> Dict:
+        """Roll Database.get_category_totals rows up into the get_statistics dictionary"""
+        count = sum(row[1] for row in rows)
         
-        if not transactions:
+        if not count:
             return {
                 'total_transactions': 0,
                 'total_income': 0.0,
@@ -45,37 +71,51 @@ class Analyzer:
                 'largest_expense': 0.0,
             }
         
-        total_income = sum(t.amount for t in transactions if t.amount > 0)
-        total_expenses = sum(abs(t.amount) for t in transactions if t.amount < 0)
+        # Totals are in cents
+        total_income = sum(row[2] for row in rows)
+        total_expenses = sum(row[3] for row in rows)
+        largest_income = max((row[4] for row in rows if row[4] is not None), default=0)
+        largest_expense = min((row[5] for row in rows if row[5] is not None), default=0)
         
         return {
-            'total_transactions': len(transactions),
-            'total_income': round(total_income, 2),
-            'total_expenses': round(total_expenses, 2),
-            'net': round(total_income - total_expenses, 2),
-            'average_transaction': round(sum(t.amount for t in transactions) / len(transactions), 2),
-            'largest_income': round(max((t.amount for t in transactions if t.amount > 0), default=0), 2),
-            'largest_expense': round(min((t.amount for t in transactions if t.amount < 0), default=0), 2),
+            'total_transactions': count,
+            'total_income': round(total_income / 100, 2),
+            'total_expenses': round(total_expenses / 100, 2),
+            'net': round((total_income - total_expenses) / 100, 2),
+            'average_transaction': round((total_income - total_expenses) / count / 100, 2),
+            'largest_income': round(largest_income / 100, 2),
+            'largest_expense': round(largest_expense / 100, 2),
         }
     
+    @_cached_until_write
     def get_by_category(self, start_date: str = None, end_date: str = None) -> Dict[str, float]:
         """Get total expenses by category"""
-        if start_date and end_date:
-            transactions = self.db.get_transactions_by_date_range(start_date, end_date)
-        else:
-            transactions = self.db.get_all_transactions()
-        
-        by_category = defaultdict(float)
-        
-        for t in transactions:
-            category = t.category or "Sans catégorie"
-            by_category[category] += abs(t.amount) if t.amount < 0 else 0
-        
+        return self._expenses_by_category(self.db.get_category_totals(start_date, end_date))
+    
+    @staticmethod
+    def _expenses_by_category(rows) -> Dict[str, float]:
+        """Get the get_by_category dictionary from Database.get_category_totals rows"""
+        by_category = {}
+        for row in rows:
+            category = row[0] or "Sans catégorie"
+            by_category[category] = by_category.get(category, 0.0) + row[3] / 100
+        
+        # Rows come largest first; re-sort in case "Sans catégorie" was merged
         return dict(sorted(by_category.items(), key=lambda x: x[1], reverse=True))
     
+    def get_full_report(self, start_date: str = None, end_date: str = None) -> Tuple[Dict, Dict[str, float]]:
+        """
+        Get statistics and expenses by category from a single query
+        
+        Returns:
+            Tuple of (get_statistics result, get_by_category result)
+        """
+        rows = self.db.get_category_totals(start_date, end_date)
+        return self._statistics_from_totals(rows), self._expenses_by_category(rows)
+    
     def get_monthly_breakdown(self, year: int = None, month: int = None) -> Dict[str, Dict]:
         """Get monthly breakdown of expenses"""
-        transactions = self.db.get_all_transactions()
+        transactions = self.db.iter_all_transactions()
         
         monthly = defaultdict(lambda: defaultdict(float))
         
@@ -90,7 +130,7 @@ class Analyzer:
     
     def get_daily_trend(self) -> Dict[str, float]:
         """Get daily total of transactions"""
-        transactions = self.db.get_all_transactions()
+        transactions = self.db.iter_all_transactions()
         
         daily = defaultdict(float)
         
@@ -106,23 +146,13 @@ class Analyzer:
             start_date: Filter from this date (format: YYYY-MM-DD)
             end_date: Filter to this date (format: YYYY-MM-DD)
         """
-        if start_date and end_date:
-            transactions = self.db.get_transactions_by_date_range(start_date, end_date)
-        else:
-            transactions = self.db.get_all_transactions()
-        
-        recurring = [t for t in transactions if t.recurrence]
-        non_recurring = [t for t in transactions if not t.recurrence]
-        
-        recurring_expenses = sum(abs(t.amount) for t in recurring if t.amount < 0)
-        recurring_income = sum(t.amount for t in recurring if t.amount > 0)
-        
-        non_recurring_expenses = sum(abs(t.amount) for t in non_recurring if t.amount < 0)
-        non_recurring_income = sum(t.amount for t in non_recurring if t.amount > 0)
+        totals = self.db.get_flag_totals('recurrence', start_date, end_date)
+        recurring_count, recurring_income, recurring_expenses = totals[True]
+        non_recurring_count, non_recurring_income, non_recurring_expenses = totals[False]
         
         return {
-            'recurring_count': len(recurring),
-            'non_recurring_count': len(non_recurring),
+            'recurring_count': recurring_count,
+            'non_recurring_count': non_recurring_count,
             'recurring_expenses': round(recurring_expenses, 2),
             'recurring_income': round(recurring_income, 2),
             'non_recurring_expenses': round(non_recurring_expenses, 2),
@@ -138,23 +168,13 @@ class Analyzer:
             start_date: Filter from this date (format: YYYY-MM-DD)
             end_date: Filter to this date (format: YYYY-MM-DD)
         """
-        if start_date and end_date:
-            transactions = self.db.get_transactions_by_date_range(start_date, end_date)
-        else:
-            transactions = self.db.get_all_transactions()
-        
-        vital = [t for t in transactions if t.vital]
-        non_vital = [t for t in transactions if not t.vital]
-        
-        vital_expenses = sum(abs(t.amount) for t in vital if t.amount < 0)
-        vital_income = sum(t.amount for t in vital if t.amount > 0)
-        
-        non_vital_expenses = sum(abs(t.amount) for t in non_vital if t.amount < 0)
-        non_vital_income = sum(t.amount for t in non_vital if t.amount > 0)
+        totals = self.db.get_flag_totals('vital', start_date, end_date)
+        vital_count, vital_income, vital_expenses = totals[True]
+        non_vital_count, non_vital_income, non_vital_expenses = totals[False]
         
         return {
-            'vital_count': len(vital),
-            'non_vital_count': len(non_vital),
+            'vital_count': vital_count,
+            'non_vital_count': non_vital_count,
             'vital_expenses': round(vital_expenses, 2),
             'vital_income': round(vital_income, 2),
             'non_vital_expenses': round(non_vital_expenses, 2),
@@ -216,8 +236,7 @@ class Analyzer:
             start_date: Filter from this date (format: YYYY-MM-DD or DD/MM/YYYY)
             end_date: Filter to this date (format: YYYY-MM-DD or DD/MM/YYYY)
         """
-        stats = self.get_statistics(start_date, end_date)
-        by_category = self.get_by_category(start_date, end_date)
+        stats, by_category = self.get_full_report(start_date, end_date)
         recurrence_stats = self.get_recurrence_statistics(start_date, end_date)
         vital_stats = self.get_vital_statistics(start_date, end_date)
         
@@ -293,34 +312,16 @@ class Analyzer:
     
     def get_monthly_statistics(self) -> Dict[str, Dict]:
         """Get statistics grouped by month"""
-        transactions = self.db.get_all_transactions()
-        monthly_stats = defaultdict(lambda: {
-            'income': 0.0,
-            'expenses': 0.0,
-            'count': 0,
-            'transactions': []
-        })
-        
-        for t in transactions:
-            # Extract YYYY-MM from date
-            month_key = t.date[:7] if len(t.date) >= 7 else t.date
-            
-            if t.amount > 0:
-                monthly_stats[month_key]['income'] += t.amount
-            else:
-                monthly_stats[month_key]['expenses'] += abs(t.amount)
-            
-            monthly_stats[month_key]['count'] += 1
-            monthly_stats[month_key]['transactions'].append(t)
-        
-        # Calculate net and ratio for each month
-        for month_key in monthly_stats:
-            stats = monthly_stats[month_key]
-            stats['net'] = stats['income'] - stats['expenses']
-            stats['income'] = round(stats['income'], 2)
-            stats['expenses'] = round(stats['expenses'], 2)
-            stats['net'] = round(stats['net'], 2)
-            stats['ratio'] = round(stats['expenses'] / stats['income'], 2) if stats['income'] > 0 else 0
+        monthly_stats = {}
+        
+        for month_key, income, expenses, count in self.db.get_monthly_totals():
+            monthly_stats[month_key] = {
+                'income': round(income, 2),
+                'expenses': round(expenses, 2),
+                'count': count,
+                'net': round(income - expenses, 2),
+                'ratio': round(expenses / income, 2) if income > 0 else 0,
+            }
         
         return dict(sorted(monthly_stats.items(), reverse=True))
     
@@ -428,22 +429,15 @@ class Analyzer:
     
     def get_savings_analysis(self) -> Dict:
         """Analyze impact of savings on finances"""
-        transactions = self.db.get_all_transactions()
-        
-        external = [t for t in transactions if not t.savings]
-        from_savings = [t for t in transactions if t.savings]
-        
-        external_income = sum(t.amount for t in external if t.amount > 0)
-        external_expenses = sum(abs(t.amount) for t in external if t.amount < 0)
-        
-        savings_income = sum(t.amount for t in from_savings if t.amount > 0)
-        savings_expenses = sum(abs(t.amount) for t in from_savings if t.amount < 0)
+        totals = self.db.get_flag_totals('savings')
+        savings_count, savings_income, savings_expenses = totals[True]
+        external_count, external_income, external_expenses = totals[False]
         
         return {
             'external_balance': round(external_income - external_expenses, 2),
             'savings_balance': round(savings_income - savings_expenses, 2),
-            'external_transactions': len(external),
-            'savings_transactions': len(from_savings),
+            'external_transactions': external_count,
+            'savings_transactions': savings_count,
             'savings_usage_ratio': round((savings_expenses / (external_expenses + savings_expenses) * 100), 2) if (external_expenses + savings_expenses) > 0 else 0,
             'external_income': round(external_income, 2),
             'external_expenses': round(external_expenses, 2),
@@ -464,8 +458,8 @@ class Analyzer:
             today = datetime.now()
             month_key = today.strftime("%Y-%m")
         
-        transactions = self.db.get_all_transactions()
-        month_trans = [t for t in transactions if t.date.startswith(month_key)]
+        # Expenses per category for the month (ISO dates compare as strings)
+        spent_by_category = self.db.sum_expenses_by_category(f"{month_key}-01", f"{month_key}-31")
         
         # Get budget objectives
         objectives = self.db.get_budget_objectives()
@@ -481,7 +475,7 @@ class Analyzer:
         
         for obj_id, category, limit in objectives:
             # Calculate spent for this category in current month
-            spent = sum(abs(t.amount) for t in month_trans if t.amount < 0 and t.category == category)
+            spent = spent_by_category.get(category, 0.0)
             remaining = limit - spent
             percentage = (spent / limit * 100) if limit > 0 else 0
             
@@ -524,7 +518,7 @@ class Analyzer:
         if start_date and end_date:
             transactions = self.db.get_transactions_by_date_range(start_date, end_date)
         else:
-            transactions = self.db.get_all_transactions()
+            transactions = self.db.iter_all_transactions()
         
         days = {0: 'Lundi', 1: 'Mardi', 2: 'Mercredi', 3: 'Jeudi', 4: 'Vendredi', 5: 'Samedi', 6: 'Dimanche'}
         weekday_stats = {day: {'count': 0, 'income': 0.0, 'expenses': 0.0, 'net': 0.0} for day in days.values()}
@@ -548,19 +542,14 @@ class Analyzer:
         if start_date and end_date:
             transactions = self.db.get_transactions_by_date_range(start_date, end_date)
         else:
-            transactions = self.db.get_all_transactions()
+            transactions = self.db.iter_all_transactions()
         
-        merchant_stats = defaultdict(lambda: {'count': 0, 'total': 0.0, 'transactions': []})
+        merchant_stats = defaultdict(lambda: {'count': 0, 'total': 0.0})
         
         for trans in transactions:
             merchant = trans.description or "Non spécifié"
             merchant_stats[merchant]['count'] += 1
             merchant_stats[merchant]['total'] += abs(trans.amount)
-            merchant_stats[merchant]['transactions'].append({
-                'date': trans.date,
-                'amount': abs(trans.amount),
-                'category': trans.category
-            })
         
         # Sort by total amount
         sorted_merchants = sorted(merchant_stats.items(), key=lambda x: x[1]['total'], reverse=True)[:limit]
@@ -582,7 +571,7 @@ class Analyzer:
         if start_date and end_date:
             transactions = self.db.get_transactions_by_date_range(start_date, end_date)
         else:
-            transactions = self.db.get_all_transactions()
+            transactions = self.db.iter_all_transactions()
         
         filtered = []
         for trans in transactions:
@@ -598,13 +587,18 @@ class Analyzer:
         if start_date and end_date:
             transactions = self.db.get_transactions_by_date_range(start_date, end_date)
         else:
-            transactions = self.db.get_all_transactions()
+            transactions = self.db.iter_all_transactions()
         
-        # Group by category
+        # Group by category, tracking weekend spending in the same pass
         category_groups = defaultdict(list)
+        weekend_spending = defaultdict(float)
         for trans in transactions:
             if trans.amount < 0:  # Only expenses
                 category_groups[trans.category].append(abs(trans.amount))
+                
+                date_obj = datetime.strptime(trans.date, "%Y-%m-%d")
+                if date_obj.weekday() >= 5:  # Saturday=5, Sunday=6
+                    weekend_spending[trans.category] += abs(trans.amount)
         
         anomalies = {
             'by_category': {},
@@ -635,14 +629,7 @@ class Analyzer:
                 }
                 anomalies['total_anomalies'] += len(anomalous)
         
-        # Find unusual times (weekend spending, etc)
-        weekend_spending = defaultdict(float)
-        for trans in transactions:
-            if trans.amount < 0:
-                date_obj = datetime.strptime(trans.date, "%Y-%m-%d")
-                if date_obj.weekday() >= 5:  # Saturday=5, Sunday=6
-                    weekend_spending[trans.category] += abs(trans.amount)
-        
+        # Unusual times (weekend spending, etc)
         if weekend_spending:
             anomalies['weekend_spending'] = {k: round(v, 2) for k, v in weekend_spending.items()}
         
@@ -1,7 +1,10 @@
 """
 Categorizer module - Handles transaction categorization
 """
-from typing import List, Dict
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Iterator, Mapping, Tuple
 from src.database import Database, Transaction
 
 
@@ -150,11 +153,32 @@ class Categorizer:
         "Éducation": ["ecole", "universite", "formation", "cours"],
     }
     
-    DEFAULT_CATEGORIES = list(DEFAULT_CATEGORIES_EXPENSES.keys()) + list(DEFAULT_CATEGORIES_INCOME.keys())
+    # AUTO_RULES compiled once into one lowercase alternation per category, in rule order
+    _CATEGORY_PATTERNS = tuple(
+        (category, re.compile("|".join(re.escape(keyword.lower()) for keyword in keywords)))
+        for category, keywords in AUTO_RULES.items()
+        if keywords
+    )
+    
+    DEFAULT_CATEGORIES = tuple(DEFAULT_CATEGORIES_EXPENSES) + tuple(DEFAULT_CATEGORIES_INCOME)
     
     def __init__(self, db: Database = None):
         """Initialize categorizer"""
         self.db = db
+        self._categories_cache = None
+        self._parent_map_cache = None
+        self._rules_cache = None
+    
+    def invalidate_categories(self):
+        """Drop the cached category list so the next read hits the database"""
+        self._categories_cache = None
+        self._parent_map_cache = None
+        # Rules are listed by category name
+        self._rules_cache = None
+    
+    def invalidate_rules(self):
+        """Drop the cached rule list so the next read hits the database"""
+        self._rules_cache = None
     
     def init_categories(self):
         """Initialize default categories and subcategories in database"""
@@ -212,6 +236,7 @@ class Categorizer:
                 pass
         
         self.db.connection.commit()
+        self.invalidate_categories()
     
     def ensure_default_categories(self):
         """Ensure default categories exist without overwriting existing ones"""
@@ -291,15 +316,19 @@ class Categorizer:
                 pass
         
         self.db.connection.commit()
+        self.invalidate_categories()
     
     def auto_categorize(self, transaction: Transaction) -> str:
         """Auto-categorize a transaction based on rules"""
-        description = transaction.description.lower()
-        
-        for category, keywords in self.AUTO_RULES.items():
-            for keyword in keywords:
-                if keyword.lower() in description:
-                    return category
+        return self._classify((transaction.description or "").strip().lower())
+    
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _classify(description: str) -> str:
+        """Match a normalized description against AUTO_RULES (memoized, rules are static)"""
+        for category, pattern in Categorizer._CATEGORY_PATTERNS:
+            if pattern.search(description):
+                return category
         
         return "Autres"
     
@@ -310,13 +339,20 @@ class Categorizer:
         
         return self.db.update_transaction_category(transaction_id, category)
     
+    def categorize_transactions_bulk(self, pairs: List[Tuple[str, int]]) -> int:
+        """Categorize many (category, transaction_id) pairs in one transaction"""
+        if not self.db or not pairs:
+            return 0
+        
+        return self.db.update_transaction_categories(pairs)
+    
     def get_uncategorized(self) -> List[Transaction]:
         """Get all uncategorized transactions"""
         if not self.db:
             return []
         
         self.db.cursor.execute("""
-            SELECT id, date, description, amount, category, created_at
+            SELECT id, date, description, amount_cents / 100.0, category, created_at
             FROM transactions
             WHERE category IS NULL
             ORDER BY date DESC
@@ -334,22 +370,67 @@ class Categorizer:
             ))
         return results
     
+    def iter_uncategorized(self, page_size: int = 64) -> Iterator[Transaction]:
+        """
+        Iterate over uncategorized transactions one page at a time
+        
+        Pages are read by (date, id) position rather than OFFSET, so rows
+        categorized while iterating do not shift the following pages.
+        """
+        if not self.db:
+            return
+        
+        last_key = None
+        while True:
+            if last_key is None:
+                self.db.cursor.execute("""
+                    SELECT id, date, description, amount_cents / 100.0, category, created_at
+                    FROM transactions
+                    WHERE category IS NULL
+                    ORDER BY date DESC, id DESC
+                    LIMIT ?
+                """, (page_size,))
+            else:
+                self.db.cursor.execute("""
+                    SELECT id, date, description, amount_cents / 100.0, category, created_at
+                    FROM transactions
+                    WHERE category IS NULL AND (date < ? OR (date = ? AND id < ?))
+                    ORDER BY date DESC, id DESC
+                    LIMIT ?
+                """, (last_key[0], last_key[0], last_key[1], page_size))
+            
+            # Fetch the whole page before yielding: callers reuse db.cursor
+            rows = self.db.cursor.fetchall()
+            for row in rows:
+                yield Transaction(
+                    id=row[0],
+                    date=row[1],
+                    description=row[2],
+                    amount=row[3],
+                    category=row[4],
+                    created_at=row[5]
+                )
+            
+            if len(rows) < page_size:
+                return
+            last_key = (rows[-1][1], rows[-1][0])
+    
+    def count_uncategorized(self) -> int:
+        """Count uncategorized transactions without loading them"""
+        if not self.db:
+            return 0
+        
+        return self.db.count_transactions(uncategorized_only=True)
+    
     def categorize_all_auto(self):
         """Auto-categorize all uncategorized transactions"""
         if not self.db:
             return 0
         
-        uncategorized = self.get_uncategorized()
-        count = 0
-        
-        for transaction in uncategorized:
-            category = self.auto_categorize(transaction)
-            if self.categorize_transaction(transaction.id, category):
-                count += 1
-        
-        return count
+        pairs = [(self.auto_categorize(t), t.id) for t in self.iter_uncategorized()]
+        return self.categorize_transactions_bulk(pairs)
     
-    def get_categories(self) -> List[str]:
+    def get_categories(self) -> Tuple[str, ...]:
         """Get all available categories"""
         return self.DEFAULT_CATEGORIES
     
@@ -364,6 +445,7 @@ class Categorizer:
                 (category_name, description)
             )
             self.db.connection.commit()
+            self.invalidate_categories()
             return True
         except:
             return False
@@ -376,6 +458,7 @@ class Categorizer:
         try:
             self.db.cursor.execute("DELETE FROM categories WHERE name = ?", (category_name,))
             self.db.connection.commit()
+            self.invalidate_categories()
             return True
         except:
             return False
@@ -398,29 +481,27 @@ class Categorizer:
                 (keyword.lower(), category_id)
             )
             self.db.connection.commit()
+            self.invalidate_rules()
             return True
         except:
             return False
     
-    def get_rules(self) -> List[dict]:
-        """Get all categorization rules"""
+    def get_rules(self) -> Tuple[Mapping, ...]:
+        """Get all categorization rules (cached read-only snapshot until a rule changes)"""
         if not self.db:
-            return []
-        
-        self.db.cursor.execute("""
-            SELECT r.id, r.keyword, c.name FROM categorization_rules r
-            JOIN categories c ON r.category_id = c.id
-            ORDER BY c.name, r.keyword
-        """)
+            return ()
         
-        rules = []
-        for row in self.db.cursor.fetchall():
-            rules.append({
-                'id': row[0],
-                'keyword': row[1],
-                'category': row[2]
-            })
-        return rules
+        if self._rules_cache is None:
+            self.db.cursor.execute("""
+                SELECT r.id, r.keyword, c.name FROM categorization_rules r
+                JOIN categories c ON r.category_id = c.id
+                ORDER BY c.name, r.keyword
+            """)
+            self._rules_cache = tuple(
+                MappingProxyType({'id': row[0], 'keyword': row[1], 'category': row[2]})
+                for row in self.db.cursor.fetchall()
+            )
+        return self._rules_cache
     
     def delete_rule(self, rule_id: int) -> bool:
         """Delete a categorization rule"""
@@ -430,28 +511,43 @@ class Categorizer:
         try:
             self.db.cursor.execute("DELETE FROM categorization_rules WHERE id = ?", (rule_id,))
             self.db.connection.commit()
+            self.invalidate_rules()
             return True
         except:
             return False
     
-    def get_all_categories_with_parent(self) -> List[Dict]:
-        """Get all categories with their parent information"""
-        if not self.db:
-            return []
+    def get_all_categories_with_parent(self) -> Tuple[Mapping, ...]:
+        """Get all categories with their parent information
         
-        self.db.cursor.execute("""
-            SELECT id, name, parent_id FROM categories
-            ORDER BY parent_id, name
-        """)
+        The rows are read once into a read-only snapshot, shared by all callers
+        until a category is added or removed through this categorizer
+        (see invalidate_categories).
+        """
+        if not self.db:
+            return ()
         
-        categories = []
-        for row in self.db.cursor.fetchall():
-            categories.append({
-                'id': row[0],
-                'name': row[1],
-                'parent_id': row[2]
-            })
-        return categories
+        if self._categories_cache is None:
+            self.db.cursor.execute("""
+                SELECT id, name, parent_id FROM categories
+                ORDER BY parent_id, name
+            """)
+            self._categories_cache = tuple(
+                MappingProxyType({'id': row[0], 'name': row[1], 'parent_id': row[2]})
+                for row in self.db.cursor.fetchall()
+            )
+        return self._categories_cache
+    
+    def get_category_parent_map(self) -> Dict[str, str]:
+        """Get a mapping of subcategory name -> parent category name"""
+        if self._parent_map_cache is None:
+            all_categories = self.get_all_categories_with_parent()
+            names_by_id = {cat['id']: cat['name'] for cat in all_categories}
+            self._parent_map_cache = {
+                cat['name']: names_by_id[cat['parent_id']]
+                for cat in all_categories
+                if cat['parent_id'] is not None and cat['parent_id'] in names_by_id
+            }
+        return dict(self._parent_map_cache)
     
     def add_subcategory(self, subcategory_name: str, parent_category_name: str, description: str = "") -> bool:
         """Add a subcategory under a parent category"""
@@ -473,6 +569,7 @@ class Categorizer:
                 (subcategory_name, parent_id, description)
             )
             self.db.connection.commit()
+            self.invalidate_categories()
             return True
         except:
             return False
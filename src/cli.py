@@ -12,22 +12,30 @@ from src.analyzer import Analyzer
 
 
 @click.group()
-def main():
+@click.pass_context
+def main(ctx):
     """Bank Analyzer - Analyze your bank statements"""
-    pass
+    # Share one database connection between commands; a caller may pass
+    # its own through obj={'db': ...} to reuse it across invocations
+    ctx.ensure_object(dict)
+    if 'db' not in ctx.obj:
+        ctx.obj['db'] = Database()
+        ctx.call_on_close(ctx.obj['db'].close)
 
 
 @main.command()
 @click.argument('filepath', type=click.Path(exists=True))
-def import_csv(filepath):
+@click.pass_context
+def import_csv(ctx, filepath):
     """Import a CSV file from your bank"""
     click.echo(f"📥 Importing {filepath}...")
     
-    db = Database()
+    db = ctx.obj['db']
     importer = CSVImporter()
     
     try:
-        transactions, warnings = importer.import_file(filepath, db)
+        # The importer skips duplicates and inserts the new rows in one batch
+        imported_count, warnings, skipped_count = importer.import_file(filepath, db)
         
         # Display warnings
         if warnings:
@@ -35,45 +43,38 @@ def import_csv(filepath):
             for warning in warnings:
                 click.echo(f"   {warning}")
         
-        # Insert transactions
-        imported_count = 0
-        for transaction in transactions:
-            db.insert_transaction(transaction)
-            imported_count += 1
-        
-        click.echo(f"\n✅ Successfully imported {imported_count} transactions")
+        click.echo(f"\n✅ Successfully imported {imported_count} transactions ({skipped_count} duplicates skipped)")
         
     except Exception as e:
         click.echo(f"❌ Error: {str(e)}", err=True)
-    finally:
-        db.close()
 
 
 @main.command()
-def categorize():
+@click.pass_context
+def categorize(ctx):
     """Categorize transactions"""
-    db = Database()
-    categorizer = Categorizer(db)
+    categorizer = Categorizer(ctx.obj['db'])
     
     click.echo("🏷️  Auto-categorizing transactions...")
     
     count = categorizer.categorize_all_auto()
     click.echo(f"✅ Categorized {count} transactions")
-    
-    db.close()
 
 
 @main.command()
 @click.option('--start', help='Start date (YYYY-MM-DD)')
 @click.option('--end', help='End date (YYYY-MM-DD)')
 @click.option('--category', help='Filter by category')
-def report(start, end, category):
+@click.pass_context
+def report(ctx, start, end, category):
     """Generate a report"""
-    db = Database()
-    analyzer = Analyzer(db)
+    analyzer = Analyzer(ctx.obj['db'])
     
     try:
-        stats = analyzer.get_statistics(start, end, category)
+        if category:
+            stats, by_cat = analyzer.get_statistics(start, end, category), None
+        else:
+            stats, by_cat = analyzer.get_full_report(start, end)
         
         click.echo("\n📊 Statistics")
         click.echo(f"   Period: {start or 'All'} to {end or 'All'}")
@@ -86,27 +87,24 @@ def report(start, end, category):
         click.echo(f"   Average: €{stats['average_transaction']:.2f}")
         
         # Category breakdown
-        if not category:
-            by_cat = analyzer.get_by_category(start, end)
-            if by_cat:
-                click.echo("\n📈 By Category:")
-                for cat, amount in by_cat.items():
-                    click.echo(f"   {cat}: €{amount:.2f}")
+        if by_cat:
+            click.echo("\n📈 By Category:")
+            for cat, amount in by_cat.items():
+                click.echo(f"   {cat}: €{amount:.2f}")
     
     except Exception as e:
         click.echo(f"❌ Error: {str(e)}", err=True)
-    finally:
-        db.close()
 
 
 @main.command()
 @click.option('--limit', default=20, help='Number of transactions to show')
-def list_transactions(limit):
+@click.pass_context
+def list_transactions(ctx, limit):
     """List recent transactions"""
-    db = Database()
+    db = ctx.obj['db']
     
     try:
-        transactions = db.get_all_transactions()[:limit]
+        transactions = db.get_recent_transactions(limit)
         
         if not transactions:
             click.echo("No transactions found")
@@ -121,18 +119,15 @@ def list_transactions(limit):
     
     except Exception as e:
         click.echo(f"❌ Error: {str(e)}", err=True)
-    finally:
-        db.close()
 
 
 @main.command()
-def init():
+@click.pass_context
+def init(ctx):
     """Initialize the database"""
     click.echo("🔧 Initializing database...")
-    db = Database()
-    categorizer = Categorizer(db)
+    categorizer = Categorizer(ctx.obj['db'])
     categorizer.init_categories()
-    db.close()
     click.echo("✅ Database initialized")
 
 
@@ -1,14 +1,126 @@
 """
 Database module - SQLite database management
 """
+import os
+import queue
 import sqlite3
+import sys
+import tempfile
+import weakref
+from contextlib import contextmanager
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Iterable, Iterator, Set, Dict, Callable
 from dataclasses import dataclass
 
 
-@dataclass
+# SQL for the hot transaction queries, kept as module constants so each
+# statement is prepared once and then served from the driver's cache
+_TRANSACTION_COLUMNS = "id, date, description, amount_cents, category, type, name, recurrence, vital, savings, created_at"
+
+_SQL_INSERT_OR_IGNORE = """
+    INSERT OR IGNORE INTO transactions (date, description, amount_cents, category, type, name, recurrence, vital, savings)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# LIMIT is always bound (-1 means no limit) so one prepared statement serves every call
+_SQL_GET_ALL = f"""
+    SELECT {_TRANSACTION_COLUMNS}
+    FROM transactions
+    ORDER BY date DESC
+    LIMIT ?
+"""
+
+# Columns shown in the transactions tree, read as plain tuples (no Transaction objects)
+_SQL_GET_RECENT_ROWS = """
+    SELECT id, date, type, name, amount_cents, category, recurrence, vital, savings
+    FROM transactions
+    ORDER BY date DESC
+    LIMIT ?
+"""
+
+_SQL_GET_BY_DATE_RANGE = f"""
+    SELECT {_TRANSACTION_COLUMNS}
+    FROM transactions
+    WHERE date >= ? AND date <= ?
+    ORDER BY date DESC
+"""
+
+_SQL_GET_BY_CATEGORY = f"""
+    SELECT {_TRANSACTION_COLUMNS}
+    FROM transactions
+    WHERE category = ?
+    ORDER BY date DESC
+"""
+
+_SQL_GET_BY_ID = f"""
+    SELECT {_TRANSACTION_COLUMNS}
+    FROM transactions
+    WHERE id = ?
+"""
+
+_SQL_UPDATE_CATEGORY = """
+    UPDATE transactions
+    SET category = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+_SQL_DUPLICATE_CHECK = """
+    SELECT id FROM transactions
+    WHERE date = ? AND description = ? AND amount_cents = ?
+    LIMIT 1
+"""
+
+_SQL_GET_KEYS = "SELECT date, description, amount_cents FROM transactions"
+
+_SQL_COUNT = "SELECT COUNT(*) FROM transactions"
+
+_SQL_COUNT_UNCATEGORIZED = "SELECT COUNT(*) FROM transactions WHERE category IS NULL"
+
+# Single ordered pass over the (date, description, amount_cents) index: every row
+# after the first (lowest id) of its group is a duplicate
+_SQL_REMOVE_DUPLICATES = """
+    DELETE FROM transactions
+    WHERE id IN (
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY date, description, amount_cents ORDER BY id
+            ) AS rn
+            FROM transactions
+        )
+        WHERE rn > 1
+    )
+"""
+
+# Columns added to transactions after the first release: (name, definition)
+_ADDED_TRANSACTION_COLUMNS = (
+    ('type', "TEXT"),
+    ('name', "TEXT"),
+    ('recurrence', "INTEGER DEFAULT 0"),
+    ('vital', "INTEGER DEFAULT 0"),
+    ('savings', "INTEGER DEFAULT 0"),
+    ('notes', "TEXT DEFAULT ''"),
+    ('updated_at', "TIMESTAMP"),
+)
+
+# Read-only connections kept open for queries (WAL lets them run alongside the writer)
+_READ_POOL_SIZE = 4
+
+# Maximum number of distinct (sql, params) results kept by Database._cached_fetch
+_QUERY_CACHE_SIZE = 64
+
+
+def to_cents(amount: float) -> int:
+    """Convert an amount in euros to the integer cents stored in the database"""
+    return int(round(amount * 100))
+
+
+# __slots__ drops the per-instance __dict__ (dataclass slots need Python 3.10+)
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Transaction:
     """Transaction data class"""
     date: str
@@ -24,35 +136,118 @@ class Transaction:
     created_at: Optional[str] = None
 
 
+def _row_to_transaction(cursor: sqlite3.Cursor, row: Tuple) -> Transaction:
+    """Row factory building a Transaction from a _TRANSACTION_COLUMNS row"""
+    return Transaction(
+        id=row[0],
+        date=row[1],
+        description=row[2],
+        amount=row[3] / 100,
+        category=row[4],
+        type=row[5],
+        name=row[6],
+        recurrence=bool(row[7]),
+        vital=bool(row[8]),
+        savings=bool(row[9]),
+        created_at=row[10]
+    )
+
+
+def _close_connections(connection: sqlite3.Connection, read_connections: List[sqlite3.Connection]):
+    """Close the writer and pooled readers (run once by close(), GC or interpreter exit)"""
+    for read_connection in read_connections:
+        read_connection.close()
+    
+    try:
+        # Writes left pending by autocommit=False are kept, not rolled back
+        if connection.in_transaction:
+            connection.commit()
+        
+        # Refresh planner stats and fold what the WAL holds back into the main
+        # file; PASSIVE never waits on readers or holds the writer lock, so
+        # closing a worker's connection can't stall the main thread's writes
+        try:
+            connection.execute("PRAGMA optimize")
+            connection.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except sqlite3.Error:
+            pass
+    finally:
+        connection.close()
+
+
 class Database:
     """Manages SQLite database for transactions"""
     
-    def __init__(self, db_path: str = "data/database.db"):
-        """Initialize database connection"""
+    def __init__(self, db_path: str = "data/database.db", autocommit: bool = True):
+        """Initialize database connection
+        
+        Args:
+            db_path: Path to the SQLite file
+            autocommit: Commit after each write method outside of transaction();
+                when False, pending writes are committed by close()
+        """
         self.db_path = Path(db_path)
+        self.autocommit = autocommit
+        self._transaction_depth = 0
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.connection = None
         self.cursor = None
+        
+        # Read caches, cleared by every write to the transactions table
+        self._query_cache: "OrderedDict[Tuple, List[Transaction]]" = OrderedDict()
+        self._count_cache: Dict[bool, int] = {}  # count_transactions(), keyed by uncategorized_only
+        self._id_cache: Dict[int, Transaction] = {}
+        
+        # Bumped on every invalidation so callers can key their own caches on it
+        self.data_version = 0
+        
         self.init_db()
+        
+        # Read-only connections for _borrow_read(), opened on first use;
+        # in-memory databases can't be shared, so they read on the writer
+        self._read_connections: List[sqlite3.Connection] = []
+        self._read_pool = queue.Queue()
+        self._pooled_reads = str(db_path) != ":memory:" and self.db_path.is_file()
+        
+        # Close the connections when the object is collected or at exit
+        # (weakref.finalize also runs from atexit; no __del__ needed)
+        self._finalizer = weakref.finalize(
+            self, _close_connections, self.connection, self._read_connections
+        )
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
     
     def init_db(self):
         """Initialize database tables"""
-        self.connection = sqlite3.connect(str(self.db_path))
+        self.connection = sqlite3.connect(str(self.db_path), cached_statements=256)
         self.cursor = self.connection.cursor()
         
+        # WAL lets readers run during writes and needs fewer fsyncs;
+        # NORMAL sync is durable in WAL mode except on power loss
+        self.cursor.execute("PRAGMA journal_mode=WAL")
+        self.cursor.execute("PRAGMA synchronous=NORMAL")
+        self.cursor.execute("PRAGMA temp_store=MEMORY")
+        self.cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
+        self.cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        
         # Create transactions table
         self.cursor.execute("""
             CREATE TABLE IF NOT EXISTS transactions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 date DATE NOT NULL,
                 description TEXT NOT NULL,
-                amount REAL NOT NULL,
+                amount_cents INTEGER NOT NULL,
                 category TEXT,
                 type TEXT,
                 name TEXT,
                 recurrence INTEGER DEFAULT 0,
                 vital INTEGER DEFAULT 0,
                 savings INTEGER DEFAULT 0,
+                notes TEXT DEFAULT '',
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
@@ -82,113 +277,401 @@ class Database:
             )
         """)
         
+        # Create budget objectives table
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS budget_objectives (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                category TEXT NOT NULL,
+                limit_amount REAL NOT NULL,
+                period TEXT DEFAULT 'monthly',
+                active INTEGER DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Create tags tables
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tags (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                color TEXT DEFAULT '#3498DB',
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS transaction_tags (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                transaction_id INTEGER NOT NULL,
+                tag_id INTEGER NOT NULL,
+                FOREIGN KEY(transaction_id) REFERENCES transactions(id) ON DELETE CASCADE,
+                FOREIGN KEY(tag_id) REFERENCES tags(id) ON DELETE CASCADE,
+                UNIQUE(transaction_id, tag_id)
+            )
+        """)
+        
+        self._migrate()
+        
+        # Indexes that exist before this run (new ones need planner statistics)
+        self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        existing_indexes = {row[0] for row in self.cursor.fetchall()}
+        
+        # Unique key used for duplicate detection on import
+        # (existing databases with duplicates: run migrate_unique_transactions.py).
+        # The fallback index records that duplicates blocked it; it is only
+        # retried by remove_duplicates() or the migration, not on every open
+        if 'idx_transactions_dup' not in existing_indexes and not self._create_unique_index():
+            # Keep duplicate lookups indexed until the migration is run
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_transactions_dup
+                ON transactions (date, description, amount_cents)
+            """)
+        
+        # Indexes for date-ordered listings/ranges and category filters
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date DESC)")
+        # (category, date) also serves date-ordered listings of one category,
+        # including the uncategorized (category IS NULL) pages; it replaces the
+        # older category and uncategorized indexes
+        self.cursor.execute("DROP INDEX IF EXISTS idx_transactions_category")
+        self.cursor.execute("DROP INDEX IF EXISTS idx_transactions_uncategorized")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_transactions_category_date ON transactions (category, date)")
+        
+        # transaction_id lookups are covered by the UNIQUE(transaction_id, tag_id)
+        # autoindex; this one covers the tag side (tag filters, ON DELETE CASCADE)
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_transaction_tags_tag ON transaction_tags (tag_id, transaction_id)")
+        
+        # Gather planner statistics once per database, and again when this
+        # run added a transactions index (e.g. after an upgrade)
+        self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='sqlite_stat1'")
+        if not self.cursor.fetchone():
+            self.cursor.execute("ANALYZE")
+        else:
+            self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'transactions'")
+            if any(row[0] not in existing_indexes for row in self.cursor.fetchall()):
+                self.cursor.execute("ANALYZE transactions")
+        
         self.connection.commit()
     
-    def insert_transaction(self, transaction: Transaction) -> int:
-        """Insert a transaction into the database"""
-        self.cursor.execute("""
-            INSERT INTO transactions (date, description, amount, category, type, name, recurrence, vital, savings)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (transaction.date, transaction.description, transaction.amount, 
-              transaction.category, transaction.type, transaction.name,
-              int(transaction.recurrence), int(transaction.vital), int(transaction.savings)))
+    def _create_unique_index(self) -> bool:
+        """Create the unique (date, description, amount_cents) index
+        
+        Drops the non-unique fallback index once the unique one exists.
+        
+        Returns:
+            False if existing duplicate rows prevent the index
+        """
+        try:
+            self.cursor.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_unique
+                ON transactions (date, description, amount_cents)
+            """)
+        except sqlite3.IntegrityError:
+            return False
+        self.cursor.execute("DROP INDEX IF EXISTS idx_transactions_dup")
+        return True
+    
+    def _migrate(self):
+        """Upgrade a transactions table created by an older version in place"""
+        self.cursor.execute("PRAGMA table_info(transactions)")
+        existing = {row[1] for row in self.cursor.fetchall()}
+        
+        for name, definition in _ADDED_TRANSACTION_COLUMNS:
+            if name not in existing:
+                self.cursor.execute(f"ALTER TABLE transactions ADD COLUMN {name} {definition}")
         
+        self._migrate_amount_cents()
+    
+    def _migrate_amount_cents(self):
+        """Rebuild a legacy transactions table storing amount REAL as amount_cents INTEGER
+        
+        Integer cents compare exactly (duplicate detection, unique index) and
+        take 1-4 bytes instead of 8. The table is copied because the old
+        column is NOT NULL and indexed, so it can't simply be dropped.
+        """
+        self.cursor.execute("PRAGMA table_info(transactions)")
+        columns = self.cursor.fetchall()
+        if 'amount' not in [column[1] for column in columns]:
+            return
+        
+        definitions = []
+        names = []
+        values = []
+        for _, name, col_type, notnull, default, pk in columns:
+            if pk:
+                definitions.append(f"{name} INTEGER PRIMARY KEY AUTOINCREMENT")
+            elif name == 'amount':
+                definitions.append("amount_cents INTEGER NOT NULL")
+            else:
+                definition = f"{name} {col_type}"
+                if notnull:
+                    definition += " NOT NULL"
+                if default is not None:
+                    definition += f" DEFAULT {default}"
+                definitions.append(definition)
+            
+            if name == 'amount':
+                names.append("amount_cents")
+                values.append("CAST(ROUND(amount * 100) AS INTEGER)")
+            else:
+                names.append(name)
+                values.append(name)
+        
+        # Indexes on the old table are dropped with it and recreated by init_db
+        self.cursor.execute("BEGIN")
+        self.cursor.execute(f"CREATE TABLE transactions_cents ({', '.join(definitions)})")
+        self.cursor.execute(
+            f"INSERT INTO transactions_cents ({', '.join(names)}) "
+            f"SELECT {', '.join(values)} FROM transactions"
+        )
+        self.cursor.execute("DROP TABLE transactions")
+        self.cursor.execute("ALTER TABLE transactions_cents RENAME TO transactions")
         self.connection.commit()
+    
+    def _open_read_connection(self) -> sqlite3.Connection:
+        """Open a read-only connection to the database file"""
+        connection = sqlite3.connect(
+            f"{self.db_path.resolve().as_uri()}?mode=ro",
+            uri=True, cached_statements=256, check_same_thread=False
+        )
+        connection.execute("PRAGMA temp_store=MEMORY")
+        connection.execute("PRAGMA cache_size=-16384")  # 16 MiB
+        connection.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        return connection
+    
+    @contextmanager
+    def _borrow_read(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection from the pool
+        
+        Inside an open write transaction (or for an in-memory database) the
+        writer connection is used instead, so reads see the uncommitted rows.
+        The pool grows on demand up to _READ_POOL_SIZE connections; borrows
+        beyond that get a temporary connection instead of waiting.
+        """
+        if self.connection.in_transaction or not self._pooled_reads:
+            yield self.connection
+            return
+        
+        try:
+            connection = self._read_pool.get_nowait()
+            pooled = True
+        except queue.Empty:
+            connection = self._open_read_connection()
+            pooled = len(self._read_connections) < _READ_POOL_SIZE
+            if pooled:
+                self._read_connections.append(connection)
+        
+        try:
+            yield connection
+        finally:
+            if pooled:
+                self._read_pool.put(connection)
+            else:
+                connection.close()
+    
+    def _query_transactions(self, sql: str, params: Tuple = ()) -> List[Transaction]:
+        """Run a _TRANSACTION_COLUMNS query on a pooled connection"""
+        with self._borrow_read() as connection:
+            cursor = connection.cursor()
+            cursor.row_factory = _row_to_transaction
+            try:
+                return cursor.execute(sql, params).fetchall()
+            finally:
+                cursor.close()
+    
+    def _commit(self):
+        """Commit a write unless it belongs to an open transaction() block"""
+        if self.autocommit and not self._transaction_depth:
+            self.connection.commit()
+    
+    @contextmanager
+    def transaction(self):
+        """Group several writes into a single commit
+        
+        Commits when the outermost block exits, rolls everything back on error.
+        Nested blocks join the outer transaction.
+        """
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            if self._transaction_depth == 1:
+                self.connection.rollback()
+                self.invalidate_cache()
+            raise
+        else:
+            if self._transaction_depth == 1:
+                self.connection.commit()
+        finally:
+            self._transaction_depth -= 1
+    
+    @staticmethod
+    def _transaction_params(transaction: Transaction) -> Tuple:
+        """Build the INSERT parameters for a transaction"""
+        return (transaction.date, transaction.description, to_cents(transaction.amount),
+                transaction.category, transaction.type, transaction.name,
+                int(transaction.recurrence), int(transaction.vital), int(transaction.savings))
+    
+    def invalidate_cache(self, transaction_id: Optional[int] = None):
+        """Drop cached query results after a write
+        
+        Args:
+            transaction_id: Only evict this id from the per-id cache (None clears it all)
+        """
+        self.data_version += 1
+        self._query_cache.clear()
+        self._count_cache.clear()
+        if transaction_id is None:
+            self._id_cache.clear()
+        else:
+            self._id_cache.pop(transaction_id, None)
+    
+    def _cached_fetch(self, sql: str, params: Tuple = ()) -> List[Transaction]:
+        """Run a Transaction query, serving repeated (sql, params) from an LRU cache"""
+        key = (sql, params)
+        rows = self._query_cache.get(key)
+        if rows is None:
+            rows = self._query_transactions(sql, params)
+            self._query_cache[key] = rows
+            if len(self._query_cache) > _QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        else:
+            self._query_cache.move_to_end(key)
+        
+        # Copy so callers can sort/filter the list without touching the cache
+        return list(rows)
+    
+    def insert_transaction(self, transaction: Transaction) -> int:
+        """Insert a transaction into the database
+        
+        Returns:
+            The new row id, or 0 if an identical transaction already exists
+        """
+        self.cursor.execute(_SQL_INSERT_OR_IGNORE, self._transaction_params(transaction))
+        # Commit even when the row was ignored: the INSERT opened an implicit
+        # transaction that would otherwise keep the write lock
+        self._commit()
+        if self.cursor.rowcount == 0:
+            return 0
+        
+        self.invalidate_cache()
         return self.cursor.lastrowid
     
+    def insert_transactions(self, transactions: Iterable[Transaction]) -> int:
+        """Insert many transactions in a single transaction, ignoring duplicates
+        
+        Rows are streamed to executemany (one prepared statement, one commit);
+        nothing is written if any row fails.
+        
+        Returns:
+            Number of rows actually inserted
+        """
+        try:
+            with self.transaction():
+                self.cursor.executemany(_SQL_INSERT_OR_IGNORE, map(self._transaction_params, transactions))
+        finally:
+            self.invalidate_cache()
+        
+        return self.cursor.rowcount
+    
     def get_all_transactions(self, limit: Optional[int] = None) -> List[Transaction]:
         """Get all transactions"""
-        query = """
-            SELECT id, date, description, amount, category, type, name, recurrence, vital, savings, created_at
-            FROM transactions
-            ORDER BY date DESC
+        return self._cached_fetch(_SQL_GET_ALL, (limit or -1,))
+    
+    def iter_all_transactions(self, batch_size: int = 1000) -> Iterator[Transaction]:
+        """Iterate over all transactions without building the full list
+        
+        Uses a dedicated cursor so other queries can run while iterating.
         """
+        with self._borrow_read() as connection:
+            cursor = connection.cursor()
+            cursor.row_factory = _row_to_transaction
+            cursor.arraysize = batch_size
+            cursor.execute(_SQL_GET_ALL, (-1,))
+            
+            try:
+                while True:
+                    rows = cursor.fetchmany()
+                    if not rows:
+                        break
+                    yield from rows
+            finally:
+                cursor.close()
+    
+    def get_recent_transactions(self, limit: int) -> List[Transaction]:
+        """Get the most recent transactions (LIMIT applied in SQL)"""
+        return self._cached_fetch(_SQL_GET_ALL, (limit,))
+    
+    def iter_recent_rows(self, limit: int, batch_size: int = 200) -> Iterator[Tuple]:
+        """Iterate over the most recent transactions as raw tuples
         
-        if limit:
-            query += f" LIMIT {limit}"
-        
-        self.cursor.execute(query)
-        
-        results = []
-        for row in self.cursor.fetchall():
-            results.append(Transaction(
-                id=row[0],
-                date=row[1],
-                description=row[2],
-                amount=row[3],
-                category=row[4],
-                type=row[5],
-                name=row[6],
-                recurrence=bool(row[7]),
-                vital=bool(row[8]),
-                savings=bool(row[9]),
-                created_at=row[10]
-            ))
-        return results
+        Yields (id, date, type, name, amount_cents, category, recurrence,
+        vital, savings) rows straight from SQLite, for display code that does
+        not need Transaction objects.
+        """
+        with self._borrow_read() as connection:
+            cursor = connection.cursor()
+            cursor.arraysize = batch_size
+            cursor.execute(_SQL_GET_RECENT_ROWS, (limit,))
+            
+            try:
+                while True:
+                    rows = cursor.fetchmany()
+                    if not rows:
+                        break
+                    yield from rows
+            finally:
+                cursor.close()
     
     def get_transactions_by_date_range(self, start_date: str, end_date: str) -> List[Transaction]:
         """Get transactions within a date range"""
-        self.cursor.execute("""
-            SELECT id, date, description, amount, category, type, name, recurrence, vital, savings, created_at
-            FROM transactions
-            WHERE date >= ? AND date <= ?
-            ORDER BY date DESC
-        """, (start_date, end_date))
-        
-        results = []
-        for row in self.cursor.fetchall():
-            results.append(Transaction(
-                id=row[0],
-                date=row[1],
-                description=row[2],
-                amount=row[3],
-                category=row[4],
-                type=row[5],
-                name=row[6],
-                recurrence=bool(row[7]),
-                vital=bool(row[8]),
-                savings=bool(row[9]),
-                created_at=row[10]
-            ))
-        return results
+        return self._cached_fetch(_SQL_GET_BY_DATE_RANGE, (start_date, end_date))
     
     def get_transactions_by_category(self, category: str) -> List[Transaction]:
         """Get transactions by category"""
-        self.cursor.execute("""
-            SELECT id, date, description, amount, category, type, name, recurrence, vital, savings, created_at
-            FROM transactions
-            WHERE category = ?
-            ORDER BY date DESC
-        """, (category,))
-        
-        results = []
-        for row in self.cursor.fetchall():
-            results.append(Transaction(
-                id=row[0],
-                date=row[1],
-                description=row[2],
-                amount=row[3],
-                category=row[4],
-                type=row[5],
-                name=row[6],
-                recurrence=bool(row[7]),
-                vital=bool(row[8]),
-                savings=bool(row[9]),
-                created_at=row[10]
-            ))
-        return results
+        return self._cached_fetch(_SQL_GET_BY_CATEGORY, (category,))
+    
+    def count_transactions(self, uncategorized_only: bool = False) -> int:
+        """Count transactions (cached until the next write)"""
+        count = self._count_cache.get(uncategorized_only)
+        if count is None:
+            sql = _SQL_COUNT_UNCATEGORIZED if uncategorized_only else _SQL_COUNT
+            with self._borrow_read() as connection:
+                count = connection.execute(sql).fetchone()[0]
+            self._count_cache[uncategorized_only] = count
+        return count
+    
+    def get_transaction_by_id(self, transaction_id: int) -> Optional[Transaction]:
+        """Get a single transaction by id"""
+        transaction = self._id_cache.get(transaction_id)
+        if transaction is None:
+            rows = self._query_transactions(_SQL_GET_BY_ID, (transaction_id,))
+            transaction = rows[0] if rows else None
+            if transaction is not None:
+                self._id_cache[transaction_id] = transaction
+        return transaction
     
     def update_transaction_category(self, transaction_id: int, category: str) -> bool:
         """Update transaction category"""
-        self.cursor.execute("""
-            UPDATE transactions
-            SET category = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (category, transaction_id))
+        self.cursor.execute(_SQL_UPDATE_CATEGORY, (category, transaction_id))
         
-        self.connection.commit()
+        self._commit()
+        self.invalidate_cache(transaction_id)
         return self.cursor.rowcount > 0
     
+    def update_transaction_categories(self, pairs: Iterable[Tuple[str, int]]) -> int:
+        """Update many (category, transaction_id) pairs in a single transaction
+        
+        Returns:
+            Number of transactions updated
+        """
+        try:
+            with self.transaction():
+                self.cursor.executemany(_SQL_UPDATE_CATEGORY, pairs)
+        finally:
+            self.invalidate_cache()
+        
+        return self.cursor.rowcount
+    
     def update_transaction_flags(self, transaction_id: int, recurrence: bool = None, vital: bool = None, savings: bool = None) -> bool:
         """Update transaction recurrence, vital and savings flags"""
         updates = []
@@ -215,43 +698,172 @@ class Database:
         query = f"UPDATE transactions SET {', '.join(updates)} WHERE id = ?"
         self.cursor.execute(query, params)
         
-        self.connection.commit()
+        self._commit()
+        self.invalidate_cache(transaction_id)
         return self.cursor.rowcount > 0
     
     def get_duplicate_check(self, date: str, description: str, amount: float) -> Optional[int]:
         """Check if transaction already exists (for duplicate detection)"""
-        self.cursor.execute("""
-            SELECT id FROM transactions
-            WHERE date = ? AND description = ? AND amount = ?
-            LIMIT 1
-        """, (date, description, amount))
+        self.cursor.execute(_SQL_DUPLICATE_CHECK, (date, description, to_cents(amount)))
         
         result = self.cursor.fetchone()
         return result[0] if result else None
     
+    def sum_expenses_by_category(self, start_date: str, end_date: str) -> Dict[Optional[str], float]:
+        """Get total expenses (as positive amounts) per category within a date range"""
+        with self._borrow_read() as connection:
+            return dict(connection.execute("""
+                SELECT category, -SUM(amount_cents) / 100.0 FROM transactions
+                WHERE date >= ? AND date <= ? AND amount_cents < 0
+                GROUP BY category
+            """, (start_date, end_date)).fetchall())
+    
+    def get_category_totals(self, start_date: str = None, end_date: str = None,
+                            category: str = None) -> List[Tuple]:
+        """
+        Aggregate transactions per category in cents
+        
+        Args:
+            start_date: Filter from this date (only applied with end_date)
+            end_date: Filter to this date (only applied with start_date)
+            category: Only aggregate this category
+        
+        Returns:
+            (category, count, income, expenses, largest income, largest expense)
+            rows, largest expenses first. Largest income/expense are None when
+            the category has no income/expense; largest expense is negative.
+        """
+        query = """
+            SELECT category, COUNT(*),
+                   TOTAL(CASE WHEN amount_cents > 0 THEN amount_cents END),
+                   TOTAL(CASE WHEN amount_cents < 0 THEN -amount_cents END),
+                   MAX(CASE WHEN amount_cents > 0 THEN amount_cents END),
+                   MIN(CASE WHEN amount_cents < 0 THEN amount_cents END)
+            FROM transactions WHERE 1 = 1
+        """
+        params = []
+        if start_date and end_date:
+            query += " AND date >= ? AND date <= ?"
+            params.extend([start_date, end_date])
+        if category:
+            query += " AND category = ?"
+            params.append(category)
+        query += " GROUP BY category ORDER BY 4 DESC, MAX(date) DESC"
+        
+        with self._borrow_read() as connection:
+            return connection.execute(query, params).fetchall()
+    
+    def get_monthly_totals(self) -> List[Tuple[str, float, float, int]]:
+        """Get (month, income, expenses, count) for each YYYY-MM month"""
+        with self._borrow_read() as connection:
+            return connection.execute("""
+                SELECT substr(date, 1, 7) AS month,
+                       TOTAL(CASE WHEN amount_cents > 0 THEN amount_cents END) / 100,
+                       TOTAL(CASE WHEN amount_cents <= 0 THEN -amount_cents END) / 100,
+                       COUNT(*)
+                FROM transactions
+                GROUP BY month
+            """).fetchall()
+    
+    def get_flag_totals(self, flag: str, start_date: str = None, end_date: str = None) -> Dict[bool, Tuple[int, float, float]]:
+        """Get (count, income, expenses) for transactions with and without a flag
+        
+        Args:
+            flag: One of 'recurrence', 'vital', 'savings'
+            start_date: Filter from this date (only applied with end_date)
+            end_date: Filter to this date (only applied with start_date)
+        """
+        if flag not in ('recurrence', 'vital', 'savings'):
+            raise ValueError(f"Unknown flag column: {flag}")
+        
+        query = f"""
+            SELECT {flag} != 0, COUNT(*),
+                   TOTAL(CASE WHEN amount_cents > 0 THEN amount_cents END) / 100,
+                   TOTAL(CASE WHEN amount_cents < 0 THEN -amount_cents END) / 100
+            FROM transactions
+        """
+        params = ()
+        if start_date and end_date:
+            query += " WHERE date >= ? AND date <= ?"
+            params = (start_date, end_date)
+        query += " GROUP BY 1"
+        
+        totals = {True: (0, 0.0, 0.0), False: (0, 0.0, 0.0)}
+        with self._borrow_read() as connection:
+            rows = connection.execute(query, params).fetchall()
+        for is_set, count, income, expenses in rows:
+            totals[bool(is_set)] = (count, income, expenses)
+        return totals
+    
+    def get_transaction_keys(self) -> Set[Tuple[str, str, int]]:
+        """Get the (date, description, amount_cents) key of every transaction (for duplicate detection)"""
+        self.cursor.execute(_SQL_GET_KEYS)
+        return set(self.cursor.fetchall())
+    
     def remove_duplicates(self) -> int:
         """Remove duplicate transactions, keeping the first occurrence"""
-        self.cursor.execute("""
-            DELETE FROM transactions
-            WHERE id NOT IN (
-                SELECT MIN(id) FROM transactions
-                GROUP BY date, description, amount
-            )
-        """)
+        with self.transaction():
+            self.cursor.execute(_SQL_REMOVE_DUPLICATES)
+            deleted_count = self.cursor.rowcount
+            # Without duplicates left, the unique index can replace the fallback
+            self._create_unique_index()
         
-        deleted_count = self.cursor.rowcount
-        self.connection.commit()
+        self.invalidate_cache()
         return deleted_count
     
-    def close(self):
-        """Close database connection"""
-        if self.connection:
-            self.connection.close()
+    def clear_all(self):
+        """Delete all transactions and categorization rules in one transaction
+        
+        Categories and budget objectives are kept.
+        """
+        try:
+            with self.transaction():
+                self.cursor.execute("DELETE FROM transactions")
+                self.cursor.execute("DELETE FROM categorization_rules")
+        finally:
+            self.invalidate_cache()
     
+    def backup_to(self, file_path: str, pages: int = 1024,
+                  progress: Callable[[int, int], None] = None):
+        """Write a consistent snapshot of the database to another file
+        
+        Uses SQLite's online backup API, copying `pages` pages per step so
+        other connections can keep working in between.
+        
+        Args:
+            file_path: Destination file (replaced if it exists)
+            pages: Pages copied per step
+            progress: Optional callback called with (copied, total) pages after each step
+        
+        Raises:
+            ValueError: If file_path is the database file itself
+        """
+        destination = Path(file_path)
+        if destination.resolve() == self.db_path.resolve() or (
+                destination.exists() and destination.samefile(self.db_path)):
+            raise ValueError(f"Cannot back up the database onto itself: {file_path}")
+        
+        def on_step(status, remaining, total):
+            progress(total - remaining, total)
+        
+        # Write next to the destination, then swap it in, so an existing file
+        # is only replaced by a complete copy
+        fd, temp_path = tempfile.mkstemp(dir=destination.resolve().parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            target = sqlite3.connect(temp_path)
+            try:
+                self.connection.backup(target, pages=pages, progress=on_step if progress else None)
+            finally:
+                target.close()
+            os.replace(temp_path, destination)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
     
-    def __del__(self):
-        """Destructor to ensure connection is closed"""
-        self.close()
+    def close(self):
+        """Close database connection"""
+        self._finalizer()
     
     # Budget Objectives Management
     def add_budget_objective(self, category: str, limit_amount: float) -> int:
@@ -261,7 +873,7 @@ class Database:
             VALUES (?, ?, 'monthly', 1)
         """, (category, limit_amount))
         
-        self.connection.commit()
+        self._commit()
         return self.cursor.lastrowid
     
     def get_budget_objectives(self) -> List[Tuple]:
@@ -281,7 +893,7 @@ class Database:
             WHERE id = ?
         """, (limit_amount, objective_id))
         
-        self.connection.commit()
+        self._commit()
         return self.cursor.rowcount > 0
     
     def delete_budget_objective(self, objective_id: int) -> bool:
@@ -292,7 +904,7 @@ class Database:
             WHERE id = ?
         """, (objective_id,))
         
-        self.connection.commit()
+        self._commit()
         return self.cursor.rowcount > 0
     
     # Tag management methods
@@ -302,8 +914,11 @@ class Database:
             INSERT OR IGNORE INTO tags (name, color)
             VALUES (?, ?)
         """, (name, color))
-        self.connection.commit()
+        self._commit()
         
+        # Only look the id up when the tag already existed
+        if self.cursor.rowcount > 0:
+            return self.cursor.lastrowid
         self.cursor.execute("SELECT id FROM tags WHERE name = ?", (name,))
         return self.cursor.fetchone()[0]
     
@@ -318,16 +933,29 @@ class Database:
             INSERT OR IGNORE INTO transaction_tags (transaction_id, tag_id)
             VALUES (?, ?)
         """, (transaction_id, tag_id))
-        self.connection.commit()
+        self._commit()
         return self.cursor.rowcount > 0
     
+    def tag_transactions_bulk(self, pairs: Iterable[Tuple[int, int]]) -> int:
+        """Add many (transaction_id, tag_id) links in a single transaction
+        
+        Returns:
+            Number of links actually added
+        """
+        with self.transaction():
+            self.cursor.executemany("""
+                INSERT OR IGNORE INTO transaction_tags (transaction_id, tag_id)
+                VALUES (?, ?)
+            """, pairs)
+        return self.cursor.rowcount
+    
     def remove_tag_from_transaction(self, transaction_id: int, tag_id: int) -> bool:
         """Remove a tag from a transaction"""
         self.cursor.execute("""
             DELETE FROM transaction_tags
             WHERE transaction_id = ? AND tag_id = ?
         """, (transaction_id, tag_id))
-        self.connection.commit()
+        self._commit()
         return self.cursor.rowcount > 0
     
     def get_transaction_tags(self, transaction_id: int) -> List[Tuple[int, str, str]]:
@@ -348,7 +976,7 @@ class Database:
             SET notes = ?
             WHERE id = ?
         """, (notes, transaction_id))
-        self.connection.commit()
+        self._commit()
         return self.cursor.rowcount > 0
     
     def get_transaction_notes(self, transaction_id: int) -> str:
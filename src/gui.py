@@ -1,10 +1,13 @@
 """
 GUI module - Graphical User Interface with Tkinter
 """
+import queue
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 from pathlib import Path
 from datetime import datetime, timedelta
+from functools import partial
+from itertools import islice
 from tkcalendar import DateEntry
 from threading import Thread
 from src.database import Database
@@ -13,6 +16,12 @@ from src.categorizer import Categorizer
 from src.analyzer import Analyzer
 
 
+# Separator lines of the text reports
+_REPORT_RULE = "=" * 120
+_REPORT_SUBRULE = "-" * 120
+_REPORT_CATEGORY_RULE = "─" * 50
+
+
 class BankAnalyzerGUI:
     """Main GUI application for Bank Analyzer"""
     
@@ -26,6 +35,9 @@ class BankAnalyzerGUI:
         'text': '#2C3E50',         # Dark text
     }
     
+    # Rows rendered up front in the transactions tree; the rest are added on scroll
+    TRANSACTIONS_PAGE_SIZE = 100
+    
     def __init__(self, root):
         """Initialize the GUI"""
         self.root = root
@@ -45,8 +57,9 @@ class BankAnalyzerGUI:
         self.analyzer = Analyzer(self.db)
         self.importer = CSVImporter()
         
-        # Initialize categories
-        self.categorizer.init_categories()
+        # Initialize categories once the window is up; category views are
+        # only filled when their tab is first shown
+        self.root.after_idle(self.categorizer.init_categories)
         
         # Background data storage for thread-safe updates
         # Workers write to these, main thread reads and updates UI
@@ -98,11 +111,25 @@ class BankAnalyzerGUI:
         # Create status bar
         self.create_status_bar()
         
-        # Initial data load (non-threaded, runs synchronously in main thread)
-        self.update_stats_display()
-        self.refresh_transactions()
-        self.refresh_categories_tree()
-        self.refresh_rules_display()
+        # Category selection dialog, built on first use (see categorize_selected_transaction)
+        self._categorize_window = None
+        self._categorize_transaction_id = None
+        # Category picker shared by add_subcategory and add_rule (see _pick_category)
+        self._category_picker = None
+        
+        # Refreshers requested by mutation handlers, run once per idle cycle
+        self._refresh_pending = set()
+        
+        # Tab contents are loaded the first time each tab is shown
+        self._tab_loaders = {
+            str(self.analysis_tab): (self.refresh_analysis,),
+            str(self.transactions_tab): (self.refresh_transactions,),
+            str(self.categories_tab): (self.refresh_categories_tree, self.refresh_rules_display),
+            str(self.budget_tab): (self.refresh_budget_tab,),
+            str(self.forecast_tab): (self.refresh_forecast,),
+            str(self.settings_tab): (self.update_info_text,),
+        }
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
         
         # Start a timer to process pending data updates from background threads
         # and schedule initial refresh once mainloop is active.
@@ -111,9 +138,26 @@ class BankAnalyzerGUI:
 
     
     def _schedule_initial_refreshes(self):
-        """Schedule initial dashboard and forecast refreshes once mainloop is active"""
+        """Schedule the initial header and dashboard refresh once mainloop is active"""
+        self.update_stats_display()
         self.refresh_dashboard()
-        self.refresh_forecast()
+    
+    def _schedule_refresh(self, *refreshers):
+        """Run refreshers once at the next idle point, however often they are requested"""
+        if not self._refresh_pending:
+            self.root.after_idle(self._flush_refreshes)
+        self._refresh_pending.update(refreshers)
+    
+    def _flush_refreshes(self):
+        """Run the refreshers queued by _schedule_refresh"""
+        refreshers, self._refresh_pending = self._refresh_pending, set()
+        for refresher in refreshers:
+            refresher()
+    
+    def _on_tab_changed(self, event=None):
+        """Load a tab's data the first time it is selected"""
+        for loader in self._tab_loaders.pop(self.notebook.select(), ()):
+            loader()
     
     def _check_pending_data_updates(self):
         """
@@ -179,9 +223,9 @@ class BankAnalyzerGUI:
         stats_frame = tk.Frame(header, bg=self.COLORS['primary'])
         stats_frame.pack(side=tk.RIGHT, padx=20, pady=10)
         
-        trans_count = len(self.db.get_all_transactions())
+        # Count filled in once the window is shown (see _schedule_initial_refreshes)
         stats_label = tk.Label(stats_frame, 
-                              text=f"📊 {trans_count} transactions",
+                              text="📊 … transactions",
                               font=("Arial", 10),
                               bg=self.COLORS['primary'], fg=self.COLORS['light'])
         stats_label.pack()
@@ -223,9 +267,6 @@ class BankAnalyzerGUI:
                                font=("Arial", 11, "bold"),
                                padx=20, pady=8, cursor="hand2")
         refresh_btn.pack(pady=10, after=title)
-        
-        # Initial refresh
-        self.refresh_dashboard()
     
     def refresh_dashboard(self):
         """Refresh dashboard with latest data (threaded for responsiveness)"""
@@ -244,24 +285,25 @@ class BankAnalyzerGUI:
         """Fetch dashboard data in background thread"""
         try:
             # Use a thread-local Database/Analyzer to avoid sqlite objects crossing threads
-            local_db = Database(str(self.db.db_path)) if hasattr(self.db, 'db_path') else Database()
-            local_analyzer = Analyzer(local_db)
+            # (closed in this thread when the block exits)
+            with (Database(str(self.db.db_path)) if hasattr(self.db, 'db_path') else Database()) as local_db:
+                local_analyzer = Analyzer(local_db)
 
-            # Get dashboard data (blocking, but in background thread)
-            summary = local_analyzer.get_dashboard_summary()
-            monthly = local_analyzer.get_monthly_statistics()
-            savings = local_analyzer.get_savings_analysis()
-            trend_chart = local_analyzer.get_monthly_trend_chart()
+                # Get dashboard data (blocking, but in background thread)
+                summary = local_analyzer.get_dashboard_summary()
+                monthly = local_analyzer.get_monthly_statistics()
+                savings = local_analyzer.get_savings_analysis()
+                trend_chart = local_analyzer.get_monthly_trend_chart()
 
-            # Some Analyzer implementations may not provide a savings chart helper.
-            # Call it only when available to avoid AttributeError in background threads.
-            savings_chart = None
-            if hasattr(local_analyzer, 'get_savings_chart') and callable(getattr(local_analyzer, 'get_savings_chart')):
-                try:
-                    savings_chart = local_analyzer.get_savings_chart()
-                except Exception:
-                    # If it fails, ignore chart generation but continue updating dashboard UI
-                    savings_chart = None
+                # Some Analyzer implementations may not provide a savings chart helper.
+                # Call it only when available to avoid AttributeError in background threads.
+                savings_chart = None
+                if hasattr(local_analyzer, 'get_savings_chart') and callable(getattr(local_analyzer, 'get_savings_chart')):
+                    try:
+                        savings_chart = local_analyzer.get_savings_chart()
+                    except Exception:
+                        # If it fails, ignore chart generation but continue updating dashboard UI
+                        savings_chart = None
 
             # Store data for main thread to process (thread-safe: just assigning a tuple)
             self.pending_dashboard_data = (summary, monthly, savings, trend_chart)
@@ -401,9 +443,6 @@ class BankAnalyzerGUI:
                                font=("Arial", 11, "bold"),
                                padx=20, pady=8, cursor="hand2")
         refresh_btn.pack(pady=10, after=title)
-        
-        # Initial refresh
-        self.refresh_analysis()
     
     def refresh_analysis(self):
         """Refresh analysis tab with detailed reports"""
@@ -555,9 +594,6 @@ class BankAnalyzerGUI:
         
         # Right-click menu
         self.budget_tree.bind("<Button-3>", self.show_budget_context_menu)
-        
-        # Initial refresh
-        self.refresh_budget_tab()
     
     def refresh_budget_tab(self):
         """Refresh budget tab"""
@@ -667,8 +703,8 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
             self.budget_tree.selection_set(row_id)
             
             menu = tk.Menu(self.root, tearoff=0)
-            menu.add_command(label="✏️ Modifier la limite", command=lambda: self.edit_budget_objective(row_id))
-            menu.add_command(label="🗑️ Supprimer", command=lambda: self.delete_budget_objective(row_id))
+            menu.add_command(label="✏️ Modifier la limite", command=partial(self.edit_budget_objective, row_id))
+            menu.add_command(label="🗑️ Supprimer", command=partial(self.delete_budget_objective, row_id))
             
             menu.post(event.x_root, event.y_root)
     
@@ -753,16 +789,18 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         date_filter_frame = ttk.LabelFrame(frame, text="📅 Filtrer par date", padding=10)
         date_filter_frame.pack(fill=tk.X, pady=10)
         
+        # Default to the previous full month
+        last_day = (datetime.now().replace(day=1) - timedelta(days=1))
+        
         ttk.Label(date_filter_frame, text="Du:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
         self.forecast_start_date = DateEntry(date_filter_frame, width=15, background='darkblue', 
                                              foreground='white', borderwidth=2,
-                                             year=(datetime.now().replace(day=1) - timedelta(days=1)).year,
-                                             month=(datetime.now().replace(day=1) - timedelta(days=1)).month,
+                                             year=last_day.year,
+                                             month=last_day.month,
                                              day=1)
         self.forecast_start_date.grid(row=0, column=1, sticky=tk.W, padx=5, pady=5)
         
         ttk.Label(date_filter_frame, text="Au:").grid(row=0, column=2, sticky=tk.W, padx=15, pady=5)
-        last_day = (datetime.now().replace(day=1) - timedelta(days=1))
         self.forecast_end_date = DateEntry(date_filter_frame, width=15, background='darkblue',
                                            foreground='white', borderwidth=2,
                                            year=last_day.year,
@@ -842,9 +880,6 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         
         # Store forecast data
         self.forecast_data = {}
-        
-        # Initial refresh
-        self.refresh_forecast()
     
     def refresh_forecast(self):
         """Refresh forecast display (threaded for responsiveness)"""
@@ -867,11 +902,12 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         """Fetch forecast data in background thread"""
         try:
             # Create a thread-local Database/Analyzer to avoid sqlite thread errors
-            local_db = Database(str(self.db.db_path)) if hasattr(self.db, 'db_path') else Database()
-            local_analyzer = Analyzer(local_db)
+            # (closed in this thread when the block exits)
+            with (Database(str(self.db.db_path)) if hasattr(self.db, 'db_path') else Database()) as local_db:
+                local_analyzer = Analyzer(local_db)
 
-            # Fetch data (blocking, but in background thread)
-            forecast_data = local_analyzer.get_forecast_data(start_date, end_date)
+                # Fetch data (blocking, but in background thread)
+                forecast_data = local_analyzer.get_forecast_data(start_date, end_date)
             
             # Store data for main thread to process (thread-safe: just assigning)
             self.pending_forecast_data = forecast_data
@@ -946,10 +982,13 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
             # Header
             start_date = self.forecast_start_date.get_date().strftime("%d/%m/%Y")
             end_date = self.forecast_end_date.get_date().strftime("%d/%m/%Y")
-            report = f"{'='*120}\n"
-            report += f"📋 RAPPORT DÉTAILLÉ DES RÉCURRENCES\n"
-            report += f"Période: {start_date} → {end_date}\n"
-            report += f"{'='*120}\n\n"
+            lines = [
+                _REPORT_RULE,
+                "📋 RAPPORT DÉTAILLÉ DES RÉCURRENCES",
+                f"Période: {start_date} → {end_date}",
+                _REPORT_RULE,
+                "",
+            ]
             
             # Aggregate data
             by_category = {}
@@ -975,16 +1014,17 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
                 by_category[cat]['items'].append(item)
             
             # Summary section
-            report += f"📊 RÉSUMÉ GLOBAL\n"
-            report += f"{'-'*120}\n"
-            report += f"  Total Transactions Vitales:      {vital_count:3d}  |  €{vital_total:10.2f}\n"
-            report += f"  Total Transactions Normales:     {non_vital_count:3d}  |  €{non_vital_total:10.2f}\n"
-            report += f"  TOTAL GÉNÉRAL:                  {vital_count + non_vital_count:3d}  |  €{vital_total + non_vital_total:10.2f}\n"
-            report += f"\n"
+            lines += [
+                "📊 RÉSUMÉ GLOBAL",
+                _REPORT_SUBRULE,
+                f"  Total Transactions Vitales:      {vital_count:3d}  |  €{vital_total:10.2f}",
+                f"  Total Transactions Normales:     {non_vital_count:3d}  |  €{non_vital_total:10.2f}",
+                f"  TOTAL GÉNÉRAL:                  {vital_count + non_vital_count:3d}  |  €{vital_total + non_vital_total:10.2f}",
+                "",
+            ]
             
             # By category section
-            report += f"📂 DÉTAIL PAR CATÉGORIE\n"
-            report += f"{'-'*120}\n"
+            lines += ["📂 DÉTAIL PAR CATÉGORIE", _REPORT_SUBRULE]
             
             for category in sorted(by_category.keys(), key=lambda x: str(x) if x is not None else ""):
                 data = by_category[category]
@@ -992,16 +1032,19 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
                 vital_pct = (data['vital'] / total_cat * 100) if total_cat > 0 else 0
                 
                 cat_display = str(category).upper() if category else "SANS CATÉGORIE"
-                report += f"\n  {cat_display}\n"
-                report += f"  {'─'*50}\n"
-                report += f"    ⭐ Vitales:     €{data['vital']:10.2f}  ({vital_pct:5.1f}%)\n"
-                report += f"    ◌ Normales:    €{data['non_vital']:10.2f}  ({100-vital_pct:5.1f}%)\n"
-                report += f"    Total:         €{total_cat:10.2f}\n"
+                lines += [
+                    "",
+                    f"  {cat_display}",
+                    f"  {_REPORT_CATEGORY_RULE}",
+                    f"    ⭐ Vitales:     €{data['vital']:10.2f}  ({vital_pct:5.1f}%)",
+                    f"    ◌ Normales:    €{data['non_vital']:10.2f}  ({100-vital_pct:5.1f}%)",
+                    f"    Total:         €{total_cat:10.2f}",
+                ]
             
-            report += f"\n{'='*120}\n"
+            lines += ["", _REPORT_RULE]
             
             # Display report
-            self.forecast_report_text.insert("1.0", report)
+            self.forecast_report_text.insert("1.0", "\n".join(lines) + "\n")
             self.forecast_report_text.config(state=tk.DISABLED)
         
         except Exception as e:
@@ -1082,11 +1125,11 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         """Update status bar message"""
         if hasattr(self, 'status_text'):
             self.status_text.config(text=message)
-            self.root.update()
+            self.root.update_idletasks()
     
     def update_stats_display(self):
         """Update header stats"""
-        trans_count = len(self.db.get_all_transactions())
+        trans_count = self.db.count_transactions()
         self.stats_label.config(text=f"📊 {trans_count} transactions")
 
     
@@ -1120,13 +1163,13 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         import_frame = tk.Frame(frame, bg=self.COLORS['light'])
         import_frame.pack(fill=tk.X, pady=20)
         
-        import_btn = tk.Button(import_frame, text="📥 Importer les données", 
-                              command=self.import_file,
-                              bg=self.COLORS['success'], fg=self.COLORS['light'],
-                              font=("Arial", 12, "bold"),
-                              height=2,
-                              cursor="hand2")
-        import_btn.pack(fill=tk.X)
+        self.import_btn = tk.Button(import_frame, text="📥 Importer les données", 
+                                   command=self.import_file,
+                                   bg=self.COLORS['success'], fg=self.COLORS['light'],
+                                   font=("Arial", 12, "bold"),
+                                   height=2,
+                                   cursor="hand2")
+        self.import_btn.pack(fill=tk.X)
         
         # Results area
         results_frame = ttk.LabelFrame(frame, text="📊 Résultats de l'importation", padding=15)
@@ -1167,21 +1210,62 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         
         self.import_text.delete(1.0, tk.END)
         self.import_text.insert(tk.END, "⏳ Importation en cours...\n")
-        self.root.update()
+        self.import_btn.config(state=tk.DISABLED)
         
+        # Parse and insert in a worker thread; results come back through the queue
+        self.import_queue = queue.Queue()
+        thread = Thread(target=self._do_import, args=(self.file_path, self.import_queue), daemon=True)
+        thread.start()
+        self.root.after(50, self._poll_import_queue)
+    
+    def _do_import(self, file_path, result_queue):
+        """Import a CSV file in a background thread"""
         try:
-            transactions, warnings, skipped_count = self.importer.import_file(self.file_path, self.db)
-            
-            imported_count = len(transactions)
-            
-            self.import_text.insert(tk.END, f"✅ Succès!\n\n")
-            self.import_text.insert(tk.END, f"📊 {imported_count} transactions importées\n")
-            self.import_text.insert(tk.END, f"⏭️ {skipped_count} doublons ignorés\n")
+            # Thread-local Database: sqlite objects must not cross threads
+            with Database(str(self.db.db_path)) as local_db:
+                result = self.importer.import_file(
+                    file_path, local_db, progress=lambda count: result_queue.put(("progress", count))
+                )
+            result_queue.put(("done",) + result)
+        except Exception as e:
+            result_queue.put(("error", str(e)))
+    
+    def _poll_import_queue(self):
+        """Drain import worker messages (runs in main thread)"""
+        try:
+            message = self.import_queue.get_nowait()
+            while message[0] == "progress":
+                self.status_text.config(text=f"⏳ {message[1]} transactions importées...")
+                message = self.import_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(50, self._poll_import_queue)
+            return
+        
+        self.import_btn.config(state=tk.NORMAL)
+        
+        if message[0] == "error":
+            self.import_text.insert(tk.END, f"❌ Erreur: {message[1]}\n")
+            messagebox.showerror("Erreur", message[1])
+            return
+        
+        _, imported_count, warnings, skipped_count = message
+        
+        # Rows were written through another connection
+        self.db.invalidate_cache()
+        
+        try:
+            # Build the whole result text, then insert it in one call
+            parts = [
+                "✅ Succès!\n\n",
+                f"📊 {imported_count} transactions importées\n",
+                f"⏭️ {skipped_count} doublons ignorés\n",
+            ]
             
             if warnings:
-                self.import_text.insert(tk.END, f"\n⚠️ Avertissements ({len(warnings)}):\n")
-                for warning in warnings:
-                    self.import_text.insert(tk.END, f"  • {warning}\n")
+                parts.append(f"\n⚠️ Avertissements ({len(warnings)}):\n")
+                parts.extend(f"  • {warning}\n" for warning in warnings)
+            
+            self.import_text.insert(tk.END, "".join(parts))
 
             messagebox.showinfo("Succès", f"{imported_count} transactions importées ({skipped_count} doublons ignorés)!")
             
@@ -1251,6 +1335,10 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         self.limit_var = tk.IntVar(value=50)
         limit_spin = ttk.Spinbox(limit_frame, from_=10, to=500, textvariable=self.limit_var, width=5)
         limit_spin.pack(side=tk.LEFT, padx=5)
+        
+        # Refresh when the limit changes, coalescing rapid spins into one rebuild
+        self._limit_refresh_job = None
+        self.limit_var.trace_add("write", self._schedule_transactions_refresh)
         ttk.Label(limit_frame, text="dernières transactions", font=("Arial", 10)).pack(side=tk.LEFT)
         
         # Right side - Refresh button
@@ -1290,7 +1378,18 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         vsb = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.transactions_tree.yview)
         hsb = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL, command=self.transactions_tree.xview)
         
-        self.transactions_tree.configure(yscroll=vsb.set, xscroll=hsb.set)
+        self._transactions_vsb = vsb
+        self.transactions_tree.configure(yscroll=self._on_transactions_yscroll, xscroll=hsb.set)
+        
+        # Configure tags for colors
+        self.transactions_tree.tag_configure("positive", foreground="green")
+        self.transactions_tree.tag_configure("negative", foreground="red")
+        
+        # Pending after_idle job filling the tree and rows not rendered yet
+        # (see refresh_transactions)
+        self._transactions_fill_job = None
+        self._pending_transaction_rows = None
+        self._transactions_shown = 0
         
         # Pack treeview and scrollbars
         self.transactions_tree.grid(row=0, column=0, sticky="nsew")
@@ -1302,62 +1401,110 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         
         # Bind right-click to show context menu
         self.transactions_tree.bind("<Button-3>", self.show_transaction_context_menu)
-        
-        # Initial load
-        self.refresh_transactions()
 
     
+    def _schedule_transactions_refresh(self, *args):
+        """Refresh the transactions list 200 ms after the last limit change"""
+        if self._limit_refresh_job is not None:
+            self.root.after_cancel(self._limit_refresh_job)
+        self._limit_refresh_job = self.root.after(200, self._refresh_transactions_for_limit)
+    
+    def _refresh_transactions_for_limit(self):
+        """Refresh the transactions list unless the limit is being typed"""
+        self._limit_refresh_job = None
+        try:
+            self.limit_var.get()
+        except tk.TclError:
+            return
+        self.refresh_transactions()
+    
     def refresh_transactions(self):
         """Refresh transactions list"""
-        # Clear treeview
-        for item in self.transactions_tree.get_children():
-            self.transactions_tree.delete(item)
+        # Drop rows still queued by a previous refresh
+        if self._transactions_fill_job is not None:
+            self.root.after_cancel(self._transactions_fill_job)
+            self._transactions_fill_job = None
+        self._pending_transaction_rows = None
         
-        # Get transactions
+        # Clear treeview in a single call
+        self.transactions_tree.delete(*self.transactions_tree.get_children())
+        
+        # Get transactions as raw rows, read in one go so no read connection
+        # stays borrowed while the tree fills
         limit = self.limit_var.get()
-        transactions = self.db.get_all_transactions(limit=limit)
+        transactions = list(self.db.iter_recent_rows(limit))
         
-        # Get all categories to find subcategories
-        all_categories = self.categorizer.get_all_categories_with_parent()
+        # Map of subcategory name -> parent name
+        cat_parent_map = self.categorizer.get_category_parent_map()
         
-        # Build a map of category name -> parent name
-        cat_parent_map = {}
-        for cat in all_categories:
-            if cat['parent_id'] is not None:
-                # This is a subcategory
-                parent = next((c for c in all_categories if c['id'] == cat['parent_id']), None)
-                if parent:
-                    cat_parent_map[cat['name']] = parent['name']
-        
-        # Add to treeview
-        for i, t in enumerate(transactions):
-            amount_str = f"€{t.amount:.2f}"
-            tag = "positive" if t.amount > 0 else "negative"
-            
-            # Get parent category if this is a subcategory
-            subcategory = ""
-            if t.category and t.category in cat_parent_map:
-                subcategory = t.category
-                main_category = cat_parent_map[t.category]
+        # Add the first page in idle-time batches; later rows are rendered as
+        # the user scrolls to the bottom
+        self._pending_transaction_rows = self._transaction_rows(transactions, cat_parent_map)
+        self._transactions_shown = 0
+        self._transactions_fill_job = self.root.after_idle(self._insert_transaction_batch)
+    
+    def _transaction_rows(self, transactions, cat_parent_map):
+        """Yield (iid, values, tags) treeview rows for raw transaction rows
+        
+        Rows are keyed by transaction id so handlers can look the
+        transaction up directly (see _transaction_for_row).
+        """
+        positive, negative = ("positive",), ("negative",)
+        
+        for (transaction_id, date, type_, name, amount_cents, category,
+             recurrence, vital, savings) in transactions:
+            # Show subcategories under their parent category
+            parent = cat_parent_map.get(category) if category else None
+            if parent:
+                main_category, subcategory = parent, category
             else:
-                main_category = t.category or "-"
+                main_category, subcategory = category or "-", "-"
             
-            # Format recurrence, vital and savings
-            recurrence_text = "✓" if t.recurrence else ""
-            vital_text = "✓" if t.vital else ""
-            savings_text = "💾" if t.savings else ""
-            
-            self.transactions_tree.insert(
-                "",
-                "end",
-                values=(t.date, t.type or "-", t.name or "-", amount_str, main_category, 
-                       subcategory or "-", recurrence_text, vital_text, savings_text),
-                tags=(tag,)
+            yield (
+                str(transaction_id),
+                (date, type_ or "-", name or "-", f"€{amount_cents / 100:.2f}", main_category, subcategory,
+                 "✓" if recurrence else "", "✓" if vital else "", "💾" if savings else ""),
+                positive if amount_cents > 0 else negative
             )
+    
+    def _insert_transaction_batch(self, batch_size=50):
+        """Insert the next batch of rows, then reschedule until the page is full"""
+        self._transactions_fill_job = None
+        rows = self._pending_transaction_rows
+        if rows is None:
+            return
         
-        # Configure tags for colors
-        self.transactions_tree.tag_configure("positive", foreground="green")
-        self.transactions_tree.tag_configure("negative", foreground="red")
+        # Hide the columns while inserting so Tk does not lay out each row
+        tree = self.transactions_tree
+        tree.configure(displaycolumns=())
+        # Call the Tcl command directly: ttk's insert() rebuilds its option
+        # list for every row
+        call, widget = tree.tk.call, tree._w
+        inserted = 0
+        try:
+            for iid, values, tags in islice(rows, batch_size):
+                call(widget, "insert", "", "end", "-id", iid, "-values", values, "-tags", tags)
+                inserted += 1
+        finally:
+            tree.configure(displaycolumns="#all")
+        self._transactions_shown += inserted
+        
+        # A short batch means the generator is exhausted
+        if inserted < batch_size:
+            self._pending_transaction_rows = None
+        elif self._transactions_shown < self.TRANSACTIONS_PAGE_SIZE:
+            self._transactions_fill_job = self.root.after_idle(self._insert_transaction_batch, batch_size)
+    
+    def _on_transactions_yscroll(self, first, last):
+        """Update the scrollbar and render more rows once the bottom is visible"""
+        self._transactions_vsb.set(first, last)
+        if (float(last) >= 1.0 and self._pending_transaction_rows is not None
+                and self._transactions_fill_job is None):
+            self._transactions_fill_job = self.root.after_idle(self._insert_transaction_batch)
+    
+    def _transaction_for_row(self, row_id):
+        """Get the transaction shown in a transactions tree row"""
+        return self.db.get_transaction_by_id(int(row_id))
     
     def show_transaction_context_menu(self, event):
         """Show context menu on right-click"""
@@ -1370,12 +1517,12 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
             menu = tk.Menu(self.root, tearoff=0)
             menu.add_command(label="🏷️ Catégoriser", command=self.categorize_selected_transaction)
             menu.add_separator()
-            menu.add_command(label="🔄 Marquer comme récurrente", command=lambda: self.toggle_recurrence(row_id))
-            menu.add_command(label="⭐ Marquer comme vitale", command=lambda: self.toggle_vital(row_id))
-            menu.add_command(label="💾 Marquer comme épargne", command=lambda: self.toggle_savings(row_id))
+            menu.add_command(label="🔄 Marquer comme récurrente", command=partial(self.toggle_recurrence, row_id))
+            menu.add_command(label="⭐ Marquer comme vitale", command=partial(self.toggle_vital, row_id))
+            menu.add_command(label="💾 Marquer comme épargne", command=partial(self.toggle_savings, row_id))
             menu.add_separator()
-            menu.add_command(label="📝 Ajouter une note", command=lambda: self.edit_transaction_notes(row_id))
-            menu.add_command(label="🏷️ Gérer les tags", command=lambda: self.manage_transaction_tags(row_id))
+            menu.add_command(label="📝 Ajouter une note", command=partial(self.edit_transaction_notes, row_id))
+            menu.add_command(label="🏷️ Gérer les tags", command=partial(self.manage_transaction_tags, row_id))
             
             # Display the menu
             menu.post(event.x_root, event.y_root)
@@ -1386,26 +1533,31 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         if not selection:
             return
         
-        # Get transaction index from treeview
-        transaction_index = self.transactions_tree.index(selection[0])
-        
-        # Get all transactions to find the ID
-        limit = self.limit_var.get()
-        transactions = self.db.get_all_transactions(limit=limit)
-        
-        if transaction_index >= len(transactions):
+        transaction = self._transaction_for_row(selection[0])
+        if transaction is None:
             return
         
-        transaction = transactions[transaction_index]
-        transaction_id = transaction.id
-        
-        # Get all categories with hierarchy
-        all_categories = self.categorizer.get_all_categories_with_parent()
-        
-        # Create category selection window
+        # The dialog is built once, then withdrawn and shown again on each use
+        if self._categorize_window is None or not self._categorize_window.winfo_exists():
+            self._build_categorize_window()
+        self._categorize_transaction_id = transaction.id
+        self._fill_categorize_tree()
+        # Don't carry the previous transaction's choice over to this one
+        cat_tree = self._categorize_tree
+        cat_tree.selection_remove(cat_tree.selection())
+        
+        window = self._categorize_window
+        window.deiconify()
+        window.lift()
+        window.focus_set()
+    
+    def _build_categorize_window(self):
+        """Create the (hidden) category selection dialog"""
         window = tk.Toplevel(self.root)
         window.title("Sélectionner une catégorie")
         window.geometry("400x500")
+        window.withdraw()
+        window.protocol("WM_DELETE_WINDOW", window.withdraw)
         
         ttk.Label(window, text="Catégorie:", font=("Arial", 12, "bold")).pack(pady=10)
         
@@ -1421,6 +1573,35 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         cat_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.config(command=cat_tree.yview)
         
+        def assign_and_close():
+            selection_item = cat_tree.selection()
+            if selection_item:
+                item_text = cat_tree.item(selection_item[0])['text']
+                # Extract category name from display text
+                selected_cat = item_text.replace("📁 ", "").replace("  ↳ ", "").strip()
+                if selected_cat:
+                    self.categorizer.categorize_transaction(self._categorize_transaction_id, selected_cat)
+                    window.withdraw()
+                    self.refresh_transactions()
+                    self.update_stats_display()
+        
+        ttk.Button(window, text="✅ Valider", command=assign_and_close).pack(pady=10)
+        
+        self._categorize_window = window
+        self._categorize_tree = cat_tree
+        self._categorize_categories = None
+    
+    def _fill_categorize_tree(self):
+        """Rebuild the dialog's category tree only when the categories changed"""
+        # The categorizer hands out the same snapshot until a category changes
+        all_categories = self.categorizer.get_all_categories_with_parent()
+        if all_categories is self._categorize_categories:
+            return
+        self._categorize_categories = all_categories
+        
+        cat_tree = self._categorize_tree
+        cat_tree.delete(*cat_tree.get_children())
+        
         # Build hierarchical tree
         parent_map = {}
         for cat in all_categories:
@@ -1435,34 +1616,12 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
                 parent_node = parent_map.get(parent_id)
                 if parent_node:
                     cat_tree.insert(parent_node, 'end', text=f"  ↳ {cat['name']}")
-        
-        def assign_and_close():
-            selection_item = cat_tree.selection()
-            if selection_item:
-                item_text = cat_tree.item(selection_item[0])['text']
-                # Extract category name from display text
-                selected_cat = item_text.replace("📁 ", "").replace("  ↳ ", "").strip()
-                if selected_cat:
-                    self.categorizer.categorize_transaction(transaction_id, selected_cat)
-                    self.refresh_transactions()
-                    self.update_stats_display()
-                    window.destroy()
-        
-        ttk.Button(window, text="✅ Valider", command=assign_and_close).pack(pady=10)
     
     def toggle_recurrence(self, row_id):
         """Toggle recurrence flag for transaction"""
-        # Get transaction index from treeview
-        transaction_index = self.transactions_tree.index(row_id)
-        
-        # Get all transactions to find the transaction
-        limit = self.limit_var.get()
-        transactions = self.db.get_all_transactions(limit=limit)
-        
-        if transaction_index >= len(transactions):
+        transaction = self._transaction_for_row(row_id)
+        if transaction is None:
             return
-        
-        transaction = transactions[transaction_index]
         new_value = not transaction.recurrence
         
         # Update database
@@ -1473,17 +1632,9 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
     
     def toggle_vital(self, row_id):
         """Toggle vital flag for transaction"""
-        # Get transaction index from treeview
-        transaction_index = self.transactions_tree.index(row_id)
-        
-        # Get all transactions to find the transaction
-        limit = self.limit_var.get()
-        transactions = self.db.get_all_transactions(limit=limit)
-        
-        if transaction_index >= len(transactions):
+        transaction = self._transaction_for_row(row_id)
+        if transaction is None:
             return
-        
-        transaction = transactions[transaction_index]
         new_value = not transaction.vital
         
         # Update database
@@ -1494,17 +1645,9 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
     
     def toggle_savings(self, row_id):
         """Toggle savings flag for transaction"""
-        # Get transaction index from treeview
-        transaction_index = self.transactions_tree.index(row_id)
-        
-        # Get all transactions to find the transaction
-        limit = self.limit_var.get()
-        transactions = self.db.get_all_transactions(limit=limit)
-        
-        if transaction_index >= len(transactions):
+        transaction = self._transaction_for_row(row_id)
+        if transaction is None:
             return
-        
-        transaction = transactions[transaction_index]
         new_value = not transaction.savings
         
         # Update database
@@ -1515,15 +1658,9 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
     
     def edit_transaction_notes(self, row_id):
         """Edit notes for a transaction"""
-        # Get transaction index
-        transaction_index = self.transactions_tree.index(row_id)
-        limit = self.limit_var.get()
-        transactions = self.db.get_all_transactions(limit=limit)
-        
-        if transaction_index >= len(transactions):
+        transaction = self._transaction_for_row(row_id)
+        if transaction is None:
             return
-        
-        transaction = transactions[transaction_index]
         current_notes = self.db.get_transaction_notes(transaction.id)
         
         # Create edit dialog
@@ -1551,15 +1688,9 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
     
     def manage_transaction_tags(self, row_id):
         """Manage tags for a transaction"""
-        # Get transaction index
-        transaction_index = self.transactions_tree.index(row_id)
-        limit = self.limit_var.get()
-        transactions = self.db.get_all_transactions(limit=limit)
-        
-        if transaction_index >= len(transactions):
+        transaction = self._transaction_for_row(row_id)
+        if transaction is None:
             return
-        
-        transaction = transactions[transaction_index]
         current_tags = self.db.get_transaction_tags(transaction.id)
         current_tag_ids = {tag[0] for tag in current_tags}
         all_tags = self.db.get_all_tags()
@@ -1595,14 +1726,15 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         scrollbar.pack(side="right", fill="y")
         
         def save_tags():
-            # Remove all existing tags
-            for tag_id, _ in [(t[0], t[1]) for t in current_tags]:
-                self.db.remove_tag_from_transaction(transaction.id, tag_id)
-            
-            # Add selected tags
-            for tag_id, var in tag_vars.items():
-                if var.get():
-                    self.db.tag_transaction(transaction.id, tag_id)
+            with self.db.transaction():
+                # Remove all existing tags
+                for tag_id, _ in [(t[0], t[1]) for t in current_tags]:
+                    self.db.remove_tag_from_transaction(transaction.id, tag_id)
+                
+                # Add selected tags
+                self.db.tag_transactions_bulk(
+                    (transaction.id, tag_id) for tag_id, var in tag_vars.items() if var.get()
+                )
             
             messagebox.showinfo("Succès", "Tags mis à jour")
             dialog.destroy()
@@ -1636,6 +1768,8 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         date_frame = ttk.LabelFrame(frame, text="📅 Sélection des dates", padding=10)
         date_frame.pack(fill=tk.X, padx=10, pady=10)
         
+        today = datetime.now()
+        
         # From date with calendar
         ttk.Label(date_frame, text="Du (inclus):").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
         self.report_from_date = DateEntry(
@@ -1644,8 +1778,8 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
             background='darkblue',
             foreground='white',
             borderwidth=2,
-            year=datetime.now().year,
-            month=datetime.now().month,
+            year=today.year,
+            month=today.month,
             day=1,
             locale='fr_FR'
         )
@@ -1662,9 +1796,9 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
             background='darkblue',
             foreground='white',
             borderwidth=2,
-            year=datetime.now().year,
-            month=datetime.now().month,
-            day=datetime.now().day,
+            year=today.year,
+            month=today.month,
+            day=today.day,
             locale='fr_FR'
         )
         self.report_to_date.grid(row=1, column=1, sticky=tk.W, padx=5, pady=5)
@@ -1899,11 +2033,11 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         
         # Use Treeview for hierarchical display
         self.categories_tree = ttk.Treeview(cat_tree_frame, yscrollcommand=scrollbar.set, height=15)
+        # Category list the tree was last built from (see refresh_categories_tree)
+        self._categories_tree_snapshot = None
         self.categories_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.config(command=self.categories_tree.yview)
         
-        self.refresh_categories_tree()
-        
         cat_btn_frame = ttk.Frame(left_frame)
         cat_btn_frame.pack(fill=tk.X)
         
@@ -1927,8 +2061,6 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         self.rules_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar2.config(command=self.rules_text.yview)
         
-        self.refresh_rules_display()
-        
         rules_btn_frame = ttk.Frame(right_frame)
         rules_btn_frame.pack(fill=tk.X)
         
@@ -1937,13 +2069,18 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
     
     def refresh_categories_tree(self):
         """Refresh categories tree view with hierarchy"""
-        # Clear existing items
-        for item in self.categories_tree.get_children():
-            self.categories_tree.delete(item)
-        
         # Get all categories
         all_cats = self.categorizer.get_all_categories_with_parent()
         
+        # Skip the rebuild when the categories have not changed
+        snapshot = tuple((cat['id'], cat['name'], cat['parent_id']) for cat in all_cats)
+        if snapshot == self._categories_tree_snapshot:
+            return
+        self._categories_tree_snapshot = snapshot
+        
+        # Clear existing items in a single call
+        self.categories_tree.delete(*self.categories_tree.get_children())
+        
         # Create mapping of parent categories
         parent_map = {}
         for cat in all_cats:
@@ -1968,12 +2105,17 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         rules = self.categorizer.get_rules()
         current_cat = None
         
+        # Build (text, tags) pairs and write them with a single Tk insert call
+        chunks = []
         for rule in rules:
             if rule['category'] != current_cat:
                 current_cat = rule['category']
-                self.rules_text.insert(tk.END, f"\n🏷️ {current_cat}:\n", "header")
+                chunks += (f"\n🏷️ {current_cat}:\n", "header")
             
-            self.rules_text.insert(tk.END, f"   • {rule['keyword']}\n")
+            chunks += (f"   • {rule['keyword']}\n", "")
+        
+        if chunks:
+            self.rules_text.insert(tk.END, *chunks)
         
         self.rules_text.tag_config("header", font=("Arial", 10, "bold"), foreground="blue")
         self.rules_text.config(state=tk.DISABLED)
@@ -1983,7 +2125,7 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         dialog = simpledialog.askstring("Ajouter une catégorie", "Nom de la catégorie:")
         if dialog:
             self.categorizer.add_category(dialog)
-            self.refresh_categories_tree()
+            self._schedule_refresh(self.refresh_categories_tree)
             messagebox.showinfo("Succès", f"Catégorie '{dialog}' ajoutée!")
     
     def add_subcategory(self):
@@ -1995,30 +2137,61 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
             messagebox.showwarning("Attention", "Aucune catégorie parent disponible")
             return
         
-        parent_window = tk.Toplevel(self.root)
-        parent_window.title("Sélectionner la catégorie parent")
-        parent_window.geometry("300x200")
-        
-        selected_parent = tk.StringVar()
-        
-        ttk.Label(parent_window, text="Catégorie parent:", font=("Arial", 10, "bold")).pack(anchor="w", padx=10, pady=10)
+        def select_parent(parent):
+            # Now ask for subcategory name
+            subcat_name = simpledialog.askstring("Ajouter une sous-catégorie", 
+                                                  f"Nom de la sous-catégorie pour '{parent}':")
+            if subcat_name:
+                self.categorizer.add_subcategory(subcat_name, parent)
+                self._schedule_refresh(self.refresh_categories_tree)
+                messagebox.showinfo("Succès", f"Sous-catégorie '{subcat_name}' ajoutée!")
         
-        for cat in categories:
-            ttk.Radiobutton(parent_window, text=cat, variable=selected_parent, value=cat).pack(anchor=tk.W, padx=30)
-        
-        def select_parent():
-            if selected_parent.get():
-                parent_window.destroy()
-                
-                # Now ask for subcategory name
-                subcat_name = simpledialog.askstring("Ajouter une sous-catégorie", 
-                                                      f"Nom de la sous-catégorie pour '{selected_parent.get()}':")
-                if subcat_name:
-                    self.categorizer.add_subcategory(subcat_name, selected_parent.get())
-                    self.refresh_categories_tree()
-                    messagebox.showinfo("Succès", f"Sous-catégorie '{subcat_name}' ajoutée!")
+        self._pick_category("Sélectionner la catégorie parent", "Catégorie parent:",
+                            "Continuer", categories, select_parent)
+    
+    def _pick_category(self, title, label, button_text, categories, on_select):
+        """Show the shared category picker and call on_select with the chosen name
         
-        ttk.Button(parent_window, text="Continuer", command=select_parent).pack(pady=10)
+        The picker window is built once, then withdrawn and shown again with
+        new values on each use.
+        """
+        if self._category_picker is None or not self._category_picker.winfo_exists():
+            window = tk.Toplevel(self.root)
+            window.geometry("300x200")
+            window.withdraw()
+            window.protocol("WM_DELETE_WINDOW", window.withdraw)
+            
+            self._category_picker_var = tk.StringVar()
+            self._category_picker_label = ttk.Label(window, font=("Arial", 10, "bold"))
+            self._category_picker_label.pack(anchor="w", padx=10, pady=10)
+            
+            # One combobox instead of a radiobutton per category
+            self._category_picker_combo = ttk.Combobox(window, textvariable=self._category_picker_var,
+                                                       state="readonly", width=30)
+            self._category_picker_combo.pack(anchor=tk.W, padx=30)
+            
+            self._category_picker_button = ttk.Button(window, command=self._on_category_picked)
+            self._category_picker_button.pack(pady=10)
+            self._category_picker = window
+        
+        window = self._category_picker
+        window.title(title)
+        self._category_picker_label.config(text=label)
+        self._category_picker_button.config(text=button_text)
+        self._category_picker_combo['values'] = categories
+        self._category_picker_var.set("")
+        self._category_picker_callback = on_select
+        
+        window.deiconify()
+        window.lift()
+        window.focus_set()
+    
+    def _on_category_picked(self):
+        """Hide the category picker and pass the selection on"""
+        selected = self._category_picker_var.get()
+        if selected:
+            self._category_picker.withdraw()
+            self._category_picker_callback(selected)
     
     def delete_category(self):
         """Delete a category"""
@@ -2028,7 +2201,7 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
             item_text = self.categories_tree.item(item_id)['text'].strip()
             if messagebox.askyesno("Confirmer", f"Supprimer '{item_text}'?"):
                 self.categorizer.delete_category(item_text)
-                self.refresh_categories_tree()
+                self._schedule_refresh(self.refresh_categories_tree)
 
     
     def add_rule(self):
@@ -2036,23 +2209,13 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         keyword = simpledialog.askstring("Ajouter une règle", "Mot-clé:")
         if keyword:
             categories = self.categorizer.get_categories()
-            # Simple selection
-            cat = tk.Toplevel(self.root)
-            cat.title("Sélectionner une catégorie")
-            
-            selected = tk.StringVar()
             
-            for c in categories:
-                ttk.Radiobutton(cat, text=c, variable=selected, value=c).pack(anchor=tk.W, padx=20)
+            def confirm(category):
+                self.categorizer.add_rule(keyword, category)
+                self._schedule_refresh(self.refresh_rules_display)
+                messagebox.showinfo("Succès", f"Règle '{keyword}' ajoutée!")
             
-            def confirm():
-                if selected.get():
-                    self.categorizer.add_rule(keyword, selected.get())
-                    self.refresh_rules_display()
-                    messagebox.showinfo("Succès", f"Règle '{keyword}' ajoutée!")
-                    cat.destroy()
-            
-            ttk.Button(cat, text="Valider", command=confirm).pack(pady=10)
+            self._pick_category("Sélectionner une catégorie", "Catégorie:", "Valider", categories, confirm)
     
     def setup_settings_tab(self):
         """Setup settings tab"""
@@ -2073,7 +2236,8 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         btn_frame.pack(fill=tk.X, pady=10)
         
         ttk.Button(btn_frame, text="📊 Statistiques BD", command=self.show_db_stats).pack(side=tk.LEFT, padx=5)
-        ttk.Button(btn_frame, text="💾 Exporter", command=self.export_db).pack(side=tk.LEFT, padx=5)
+        self.export_db_btn = ttk.Button(btn_frame, text="💾 Exporter", command=self.export_db)
+        self.export_db_btn.pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="� Supprimer doublons", command=self.remove_duplicates).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="�🗑️ Vider", command=self.clear_db).pack(side=tk.LEFT, padx=5)
         
@@ -2083,28 +2247,41 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
         
         self.info_text = tk.Text(info_frame, height=10)
         self.info_text.pack(fill=tk.BOTH, expand=True)
-        
-        self.update_info_text()
+        # Counts the info text was last rendered from (see update_info_text)
+        self._info_counts = None
     
     def update_info_text(self):
-        """Update the info text in settings tab"""
-        info = f"""
-📱 Bank Analyzer v0.1.0
-
-📁 Base de données: data/database.db
-💾 Localisation: {self.db.db_path}
-
-📊 Contenu actuel:
-   • {len(self.db.get_all_transactions())} transactions importées
-   • {len(self.categorizer.get_uncategorized())} non catégorisées
-
-⚙️ Catégories:
-   • {len(self.categorizer.get_categories())} catégories
-   • {len(self.categorizer.get_rules())} règles de catégorisation
-
-✅ Toutes les données sont stockées localement.
-🔒 Aucune synchronisation cloud.
-        """
+        """Update the info text in settings tab (only rewritten when the counts change)"""
+        counts = (
+            self.db.count_transactions(),
+            self.categorizer.count_uncategorized(),
+            len(self.categorizer.get_categories()),
+            len(self.categorizer.get_rules()),
+        )
+        if counts == self._info_counts:
+            return
+        self._info_counts = counts
+        transaction_count, uncategorized_count, category_count, rule_count = counts
+        
+        info = "\n".join((
+            "",
+            "📱 Bank Analyzer v0.1.0",
+            "",
+            "📁 Base de données: data/database.db",
+            f"💾 Localisation: {self.db.db_path}",
+            "",
+            "📊 Contenu actuel:",
+            f"   • {transaction_count} transactions importées",
+            f"   • {uncategorized_count} non catégorisées",
+            "",
+            "⚙️ Catégories:",
+            f"   • {category_count} catégories",
+            f"   • {rule_count} règles de catégorisation",
+            "",
+            "✅ Toutes les données sont stockées localement.",
+            "🔒 Aucune synchronisation cloud.",
+            "",
+        ))
         
         self.info_text.config(state=tk.NORMAL)
         self.info_text.delete(1.0, tk.END)
@@ -2113,8 +2290,8 @@ Alertes: {budget_status['alert_count']} objectif(s) dépassé(s) ou en attention
     
     def show_db_stats(self):
         """Show database statistics"""
-        total = len(self.db.get_all_transactions())
-        uncategorized = len(self.categorizer.get_uncategorized())
+        total = self.db.count_transactions()
+        uncategorized = self.categorizer.count_uncategorized()
         
         stats = f"""
 Statistiques de la Base de Données
@@ -2138,29 +2315,64 @@ Règles: {len(self.categorizer.get_rules())}
         )
         
         if file_path:
-            import shutil
-            shutil.copy(str(self.db.db_path), file_path)
-            messagebox.showinfo("Succès", f"Base de données exportée vers:\n{file_path}")
+            self.update_status("⏳ Export de la base de données...")
+            # One export at a time; re-enabled when the worker reports back
+            self.export_db_btn.config(state=tk.DISABLED)
+            
+            # Copy in a worker thread; the result comes back through the queue
+            export_queue = queue.Queue()
+            thread = Thread(target=self._do_export, args=(file_path, export_queue), daemon=True)
+            thread.start()
+            self.root.after(50, self._poll_export_queue, export_queue)
+    
+    def _do_export(self, file_path, result_queue):
+        """Back up the database to a file in a background thread"""
+        try:
+            # Thread-local Database: sqlite objects must not cross threads
+            with Database(str(self.db.db_path)) as local_db:
+                local_db.backup_to(
+                    file_path, progress=lambda copied, total: result_queue.put(("progress", copied, total))
+                )
+            result_queue.put(("done", file_path))
+        except Exception as e:
+            result_queue.put(("error", str(e)))
+    
+    def _poll_export_queue(self, export_queue):
+        """Drain export worker messages (runs in main thread)"""
+        try:
+            message = export_queue.get_nowait()
+            while message[0] == "progress":
+                _, copied, total = message
+                self.status_text.config(text=f"⏳ Export de la base de données... {copied * 100 // max(total, 1)}%")
+                message = export_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(50, self._poll_export_queue, export_queue)
+            return
+        
+        self.export_db_btn.config(state=tk.NORMAL)
+        
+        if message[0] == "error":
+            self.update_status("❌ Échec de l'export")
+            messagebox.showerror("Erreur", message[1])
+            return
+        
+        self.update_status("✅ Base de données exportée")
+        messagebox.showinfo("Succès", f"Base de données exportée vers:\n{message[1]}")
     
     def clear_db(self):
         """Clear database"""
         if messagebox.askyesno("Attention!", "Vider complètement la base de données?\n\nCette action est irréversible!\n(Les catégories personnalisées seront conservées)"):
             try:
-                # Delete all transactions
-                self.db.cursor.execute("DELETE FROM transactions")
-                self.db.connection.commit()
-                
-                # Delete all categorization rules
-                self.db.cursor.execute("DELETE FROM categorization_rules")
-                self.db.connection.commit()
+                # Delete all transactions and categorization rules in one transaction
+                self.db.clear_all()
+                self.categorizer.invalidate_rules()
                 
                 # Ensure default categories exist (without deleting custom ones)
                 self.categorizer.ensure_default_categories()
                 
                 # Refresh all views
                 self.refresh_transactions()
-                self.refresh_categories_tree()
-                self.refresh_rules_display()
+                self._schedule_refresh(self.refresh_categories_tree, self.refresh_rules_display)
                 # Clear report area if exists
                 try:
                     for widget in self.report_frame.winfo_children():
@@ -5,8 +5,8 @@ import csv
 import chardet
 from pathlib import Path
 from datetime import datetime
-from typing import List, Tuple
-from src.database import Database, Transaction
+from typing import List, Tuple, Iterator, Callable
+from src.database import Database, Transaction, to_cents
 
 
 class CSVImporter:
@@ -24,6 +24,9 @@ class CSVImporter:
         'date_format': '%d/%m/%Y'
     }
     
+    # Files at least this large are parsed with pandas' C parser
+    FAST_PATH_MIN_BYTES = 5_000_000
+    
     def __init__(self, config: dict = None):
         """Initialize importer with optional custom config"""
         self.config = {**self.DEFAULT_CONFIG, **(config or {})}
@@ -34,36 +37,33 @@ class CSVImporter:
             result = chardet.detect(f.read(10000))
             return result.get('encoding', 'utf-8')
     
-    def _parse_csv(self, filepath: str) -> List[dict]:
-        """Parse CSV file and return list of rows"""
-        encoding = self.config.get('encoding')
-        delimiter = self.config.get('delimiter', ',')
+    def _find_header_row(self, filepath: str, encoding: str) -> int:
+        """Find the index of the header line, reading the file line by line"""
+        expected_keywords = {'Date', 'Libellé', 'Débit', 'Crédit'}
+        fallback_idx = None
         
-        rows = []
-        try:
-            with open(filepath, 'r', encoding=encoding) as f:
-                lines = f.readlines()
-            
-            # Find the header row by looking for the line with our expected columns
-            header_row_idx = None
-            expected_keywords = {'Date', 'Libellé', 'Débit', 'Crédit'}
-            
-            for idx, line in enumerate(lines):
+        with open(filepath, 'r', encoding=encoding) as f:
+            for idx, line in enumerate(f):
                 # Check if this line looks like a header
                 line_upper = line.upper()
                 if all(keyword.upper() in line_upper for keyword in expected_keywords):
-                    header_row_idx = idx
-                    break
-            
-            if header_row_idx is None:
-                # Fallback: try to find line with Date and Libellé
-                for idx, line in enumerate(lines):
-                    if 'Date' in line and 'Libellé' in line:
-                        header_row_idx = idx
-                        break
-            
-            if header_row_idx is None:
-                raise ValueError("Could not find header row in CSV file")
+                    return idx
+                
+                # Fallback: first line with Date and Libellé
+                if fallback_idx is None and 'Date' in line and 'Libellé' in line:
+                    fallback_idx = idx
+        
+        if fallback_idx is None:
+            raise ValueError("Could not find header row in CSV file")
+        return fallback_idx
+    
+    def _iter_csv(self, filepath: str) -> Iterator[dict]:
+        """Parse CSV file and yield its non-empty rows"""
+        encoding = self.config.get('encoding')
+        delimiter = self.config.get('delimiter', ',')
+        
+        try:
+            header_row_idx = self._find_header_row(filepath, encoding)
             
             # Now parse from the header row onward
             with open(filepath, 'r', encoding=encoding) as f:
@@ -76,12 +76,14 @@ class CSVImporter:
                 for row in reader:
                     # Skip empty rows and rows with all empty values
                     if row and any(str(v).strip() for v in row.values()):
-                        rows.append(row)
-            
-            return rows
+                        yield row
         except Exception as e:
             raise Exception(f"Error parsing CSV: {str(e)}")
     
+    def _parse_csv(self, filepath: str) -> List[dict]:
+        """Parse CSV file and return list of rows"""
+        return list(self._iter_csv(filepath))
+    
     def _parse_description(self, description: str) -> tuple:
         """
         Parse description to extract type and name
@@ -114,10 +116,11 @@ class CSVImporter:
         
         transaction_type = "AUTRE"
         name = description
+        description_upper = description.upper()
         
         # Find the transaction type
         for t_type in transaction_types:
-            if description.upper().startswith(t_type):
+            if description_upper.startswith(t_type):
                 transaction_type = t_type
                 # Extract name after type
                 name = description[len(t_type):].strip()
@@ -164,6 +167,19 @@ class CSVImporter:
         except ValueError:
             return 0.0
     
+    @staticmethod
+    def _clean_amounts(amounts):
+        """Vectorized _clean_amount for a pandas Series of strings"""
+        import pandas as pd
+        
+        cleaned = (amounts.str.replace(' ', '', regex=False)
+                          .str.replace('\xa0', '', regex=False)
+                          .str.strip()
+                          .str.replace(',', '.', regex=False))
+        # Keep only the last dot as decimal separator
+        cleaned = cleaned.str.replace(r'\.(?=.*\.)', '', regex=True)
+        return pd.to_numeric(cleaned, errors='coerce').fillna(0.0)
+    
     def _parse_date(self, date_str: str) -> str:
         """Parse date and convert to ISO format (YYYY-MM-DD)"""
         try:
@@ -172,39 +188,35 @@ class CSVImporter:
         except ValueError as e:
             raise ValueError(f"Cannot parse date '{date_str}': {str(e)}")
     
-    def import_file(self, filepath: str, db: Database = None) -> Tuple[List[Transaction], List[str]]:
+    def iter_transactions(self, filepath: str, warnings: List[str],
+                          chunk_size: int = 5000) -> Iterator[List[Transaction]]:
         """
-        Import CSV file and return transactions and warnings
+        Parse a CSV file and yield its transactions in lists of chunk_size
         
-        Returns:
-            Tuple of (transactions list, warnings list)
-            Transactions are saved to database if db is provided
-            Duplicates are automatically skipped
+        Rows that can't be parsed are reported in warnings and skipped.
+        Only one chunk is held in memory at a time.
         """
         if not Path(filepath).exists():
             raise FileNotFoundError(f"File not found: {filepath}")
         
-        warnings = []
-        transactions = []
-        duplicates_skipped = 0
+        if Path(filepath).stat().st_size >= self.FAST_PATH_MIN_BYTES:
+            yield from self._iter_transactions_fast(filepath, warnings, chunk_size)
+            return
         
-        try:
-            rows = self._parse_csv(filepath)
-            
-            if not rows:
-                warnings.append("No transactions found in file")
-                return transactions, warnings
-            
-            date_col = self.config['date_column']
-            desc_col = self.config['description_column']
-            debit_col = self.config['debit_column']
-            credit_col = self.config['credit_column']
-            
+        date_col = self.config['date_column']
+        desc_col = self.config['description_column']
+        debit_col = self.config['debit_column']
+        credit_col = self.config['credit_column']
+        
+        chunk = []
+        rows_found = False
+        
+        for idx, row in enumerate(self._iter_csv(filepath), start=1):
             # Check required columns - be flexible with whitespace
-            if rows:
-                first_row = rows[0]
+            if not rows_found:
+                rows_found = True
                 # Clean column names from whitespace
-                available_cols = {k.strip(): v for k, v in first_row.items()}
+                available_cols = {k.strip(): v for k, v in row.items()}
                 required_cols = [date_col, desc_col, debit_col, credit_col]
                 
                 missing_cols = [col for col in required_cols if col not in available_cols]
@@ -214,48 +226,184 @@ class CSVImporter:
                     available_names = list(available_cols.keys())
                     raise ValueError(f"Missing columns in CSV. Expected: {', '.join(required_cols)}\nFound: {', '.join(available_names)}")
             
-            # Process each row
-            for idx, row in enumerate(rows, start=1):
-                try:
-                    # Clean row keys (strip whitespace)
-                    clean_row = {k.strip(): v for k, v in row.items()}
-                    
-                    date = self._parse_date(clean_row.get(date_col, '').strip())
-                    description = clean_row.get(desc_col, '').strip()
+            try:
+                # Clean row keys (strip whitespace)
+                clean_row = {k.strip(): v for k, v in row.items()}
+                
+                date = self._parse_date(clean_row.get(date_col, '').strip())
+                description = clean_row.get(desc_col, '').strip()
+                
+                debit = self._clean_amount(clean_row.get(debit_col, ''))
+                credit = self._clean_amount(clean_row.get(credit_col, ''))
+                
+                # Combine debit/credit: debit is negative, credit is positive
+                amount = credit - debit if credit > 0 else -debit
+                
+                if not description:
+                    warnings.append(f"Row {idx}: Empty description, skipping")
+                    continue
+                
+                # Parse description to extract type and name
+                trans_type, trans_name = self._parse_description(description)
+                
+                chunk.append(Transaction(
+                    date=date,
+                    description=description,
+                    amount=amount,
+                    type=trans_type,
+                    name=trans_name
+                ))
+            
+            except ValueError as e:
+                warnings.append(f"Row {idx}: {str(e)}")
+                continue
+            
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        
+        if not rows_found:
+            warnings.append("No transactions found in file")
+        
+        if chunk:
+            yield chunk
+    
+    def _iter_transactions_fast(self, filepath: str, warnings: List[str],
+                                chunk_size: int) -> Iterator[List[Transaction]]:
+        """
+        Vectorized iter_transactions for large files
+        
+        Tokenizing, date parsing and amount cleaning run in pandas per chunk;
+        only the description parsing is done row by row. Warnings and row
+        numbers match iter_transactions.
+        """
+        import pandas as pd
+        
+        encoding = self.config.get('encoding')
+        delimiter = self.config.get('delimiter', ',')
+        date_col = self.config['date_column']
+        desc_col = self.config['description_column']
+        debit_col = self.config['debit_column']
+        credit_col = self.config['credit_column']
+        required_cols = [date_col, desc_col, debit_col, credit_col]
+        
+        header_row_idx = self._find_header_row(filepath, encoding)
+        row_count = 0
+        
+        with open(filepath, 'r', encoding=encoding, newline='') as f:
+            # Skip to header row
+            for _ in range(header_row_idx):
+                f.readline()
+            
+            try:
+                reader = pd.read_csv(f, sep=delimiter, dtype=str, na_filter=False,
+                                     chunksize=chunk_size, engine='c')
+                for frame in reader:
+                    frame.columns = [str(col).strip() for col in frame.columns]
                     
-                    debit = self._clean_amount(clean_row.get(debit_col, ''))
-                    credit = self._clean_amount(clean_row.get(credit_col, ''))
+                    # Skip rows with all empty values
+                    stripped = frame.apply(lambda col: col.str.strip())
+                    stripped = stripped[stripped.ne('').any(axis=1)]
+                    if stripped.empty:
+                        continue
+                    frame = frame.loc[stripped.index]
                     
-                    # Combine debit/credit: debit is negative, credit is positive
-                    amount = credit - debit if credit > 0 else -debit
+                    if row_count == 0:
+                        missing_cols = [col for col in required_cols if col not in frame.columns]
+                        if missing_cols:
+                            raise ValueError(f"Missing columns in CSV. Expected: {', '.join(required_cols)}\nFound: {', '.join(frame.columns)}")
                     
-                    if not description:
-                        warnings.append(f"Row {idx}: Empty description, skipping")
-                        continue
+                    raw_dates = stripped[date_col]
+                    dates = pd.to_datetime(raw_dates, format=self.config['date_format'],
+                                           errors='coerce').dt.strftime('%Y-%m-%d')
+                    descriptions = stripped[desc_col]
                     
-                    # Parse description to extract type and name
-                    trans_type, trans_name = self._parse_description(description)
+                    # Combine debit/credit: debit is negative, credit is positive
+                    debit = self._clean_amounts(frame[debit_col])
+                    credit = self._clean_amounts(frame[credit_col])
+                    amounts = credit.where(credit > 0, 0.0) - debit
                     
-                    transaction = Transaction(
-                        date=date,
-                        description=description,
-                        amount=amount,
-                        type=trans_type,
-                        name=trans_name
-                    )
+                    chunk = []
+                    rows = zip(range(row_count + 1, row_count + len(frame) + 1), dates.tolist(),
+                               raw_dates.tolist(), descriptions.tolist(), amounts.tolist())
+                    row_count += len(frame)
                     
-                    # Check for duplicates if db provided
-                    if db:
-                        if db.get_duplicate_check(date, description, amount):
-                            duplicates_skipped += 1
+                    for idx, date, raw_date, description, amount in rows:
+                        # Unparsed dates come back as NaN; strptime gives the warning text
+                        if not isinstance(date, str):
+                            try:
+                                date = self._parse_date(raw_date)
+                            except ValueError as e:
+                                warnings.append(f"Row {idx}: {str(e)}")
+                                continue
+                        
+                        if not description:
+                            warnings.append(f"Row {idx}: Empty description, skipping")
                             continue
+                        
+                        trans_type, trans_name = self._parse_description(description)
+                        
+                        chunk.append(Transaction(
+                            date=date,
+                            description=description,
+                            amount=amount,
+                            type=trans_type,
+                            name=trans_name
+                        ))
                     
-                    transactions.append(transaction)
+                    if chunk:
+                        yield chunk
+            except pd.errors.ParserError as e:
+                raise Exception(f"Error parsing CSV: {str(e)}")
+        
+        if row_count == 0:
+            warnings.append("No transactions found in file")
+    
+    def import_file(self, filepath: str, db: Database = None,
+                    progress: Callable[[int], None] = None) -> Tuple[int, List[str], int]:
+        """
+        Import CSV file chunk by chunk
+        
+        Args:
+            filepath: CSV file to import
+            db: Database to save transactions to (parse only if None)
+            progress: Called with the running count after each chunk
+        
+        Returns:
+            Tuple of (imported count, warnings list, duplicates skipped)
+            Duplicates (against the database and within the file) are skipped
+        """
+        warnings = []
+        imported_count = 0
+        duplicates_skipped = 0
+        
+        try:
+            # Load existing keys once instead of querying per row
+            existing_keys = db.get_transaction_keys() if db else set()
+            
+            for chunk in self.iter_transactions(filepath, warnings):
+                new_transactions = []
+                for transaction in chunk:
+                    key = (transaction.date, transaction.description, to_cents(transaction.amount))
+                    if key in existing_keys:
+                        duplicates_skipped += 1
+                        continue
+                    existing_keys.add(key)
+                    new_transactions.append(transaction)
                 
-                except ValueError as e:
-                    warnings.append(f"Row {idx}: {str(e)}")
-                    continue
+                # Save each chunk as soon as it is parsed; count what the
+                # database actually inserted (the unique index may still drop rows)
+                if db and new_transactions:
+                    inserted = db.insert_transactions(new_transactions)
+                    duplicates_skipped += len(new_transactions) - inserted
+                    imported_count += inserted
+                elif not db:
+                    imported_count += len(new_transactions)
+                if progress:
+                    progress(imported_count)
         
+        except FileNotFoundError:
+            raise
         except Exception as e:
             raise Exception(f"Import failed: {str(e)}")
         
@@ -263,9 +411,4 @@ class CSVImporter:
         if duplicates_skipped > 0:
             warnings.append(f"⚠️ {duplicates_skipped} transaction(s) dupliquée(s) ignorée(s)")
         
-        # Save transactions to database if db provided
-        if db and transactions:
-            for transaction in transactions:
-                db.insert_transaction(transaction)
-        
-        return transactions, warnings, duplicates_skipped
+        return imported_count, warnings, duplicates_skipped
@@ -14,7 +14,8 @@ def test_import(filepath):
     importer = CSVImporter()
     
     try:
-        transactions, warnings = importer.import_file(filepath)
+        warnings = []
+        transactions = [t for chunk in importer.iter_transactions(filepath, warnings) for t in chunk]
         
         print(f"✅ Success!\n")
         print(f"📊 {len(transactions)} transactions parsed")